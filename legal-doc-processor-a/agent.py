@@ -21,7 +21,7 @@ for path in (SRC_DIR, PROJECT_ROOT):
         sys.path.insert(0, path)
 
 from src.graph.workflow import run_adk_a
-from src.utils.persistence import persist_json_output, persist_markdown_output
+from src.utils.persistence import persist_batch, persist_json_output, persist_markdown_output, persist_ndjson_output, to_plain
 from src.utils.reporting import build_adk_a_markdown_report
 from src.config import (
     MCP_SERVER_B_URL,
@@ -257,10 +257,14 @@ def process_legal_document(
         if document_path:
             save_name = Path(document_path).stem
         
-        markdown_report = build_adk_a_markdown_report(result_dict)
-        result_dict["markdown_report"] = markdown_report
-        persist_json_output("adk_a", save_name, result_dict)
-        persist_markdown_output("adk_a", save_name, markdown_report)
+        # Dump the models once for the report and archive; result_dict keeps the models
+        plain_result = to_plain(result_dict)
+        markdown_report = build_adk_a_markdown_report(plain_result)
+        result_dict["markdown_report"] = plain_result["markdown_report"] = markdown_report
+        with persist_batch() as timestamp:
+            persist_json_output("adk_a", save_name, plain_result, timestamp=timestamp)
+            persist_markdown_output("adk_a", save_name, markdown_report, timestamp=timestamp)
+            persist_ndjson_output("adk_a_clauses", save_name, plain_result.get("extracted_clauses", []), timestamp=timestamp)
 
         adk_b_summary: Optional[Dict[str, Any]] = None
         if ENABLE_A2A_DISPATCH and result_dict.get("ready_for_suggestions"):
@@ -2,9 +2,11 @@ import sys
 import argparse
 from src.graph.workflow import run_adk_a
 from src.utils.persistence import (
+    persist_batch,
     persist_json_output,
     persist_markdown_output,
-    serialize_payload,
+    persist_ndjson_output,
+    to_plain,
 )
 from src.utils.reporting import build_adk_a_markdown_report
 import json
@@ -39,11 +41,15 @@ def main():
         document_text=args.document_text,
         document_type=args.document_type
     )
-    markdown_report = build_adk_a_markdown_report(result)
-    result["markdown_report"] = markdown_report
-    archive_path = persist_json_output("adk_a", args.document_id, result)
-    logger.info("ADK-A result archived to %s", archive_path)
-    markdown_path = persist_markdown_output("adk_a", args.document_id, markdown_report)
+    # Dump the models once; the report and the archives share the plain copy
+    plain_result = to_plain(result)
+    markdown_report = build_adk_a_markdown_report(plain_result)
+    result["markdown_report"] = plain_result["markdown_report"] = markdown_report
+    with persist_batch() as timestamp:
+        archive_path = persist_json_output("adk_a", args.document_id, plain_result, timestamp=timestamp)
+        logger.info("ADK-A result archived to %s", archive_path)
+        markdown_path = persist_markdown_output("adk_a", args.document_id, markdown_report, timestamp=timestamp)
+        persist_ndjson_output("adk_a_clauses", args.document_id, plain_result.get("extracted_clauses", []), timestamp=timestamp)
     logger.info("ADK-A markdown report archived to %s", markdown_path)
     
     # Print summary
@@ -67,7 +73,7 @@ def main():
     # Save to file if requested
     if args.output:
         with open(args.output, 'w') as f:
-            json.dump(serialize_payload(result), f, indent=2)
+            json.dump(plain_result, f, indent=2)
         logger.info(f"Results saved to: {args.output}")
     
     return 0 if result['status'] != 'error' else 1
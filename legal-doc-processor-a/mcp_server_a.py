@@ -1,15 +1,24 @@
 from flask import Flask, request, jsonify
 from pymongo import MongoClient
+from pymongo.collection import Collection
 from src.config import MCP_SERVER_A_PORT, MONGODB_URI, DATABASE_NAME
 from src.graph.workflow import run_adk_a
 from src.utils.persistence import (
+    persist_batch,
     persist_json_output,
     persist_markdown_output,
-    serialize_payload,
+    persist_ndjson_output,
+    to_plain,
 )
 from src.utils.reporting import build_adk_a_markdown_report
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
+import hashlib
 import logging
 import json
+import threading
+import time
 import certifi
 
 logging.basicConfig(level=logging.INFO)
@@ -41,10 +50,61 @@ def _build_mongo_client() -> MongoClient:
         logger.warning("Connected to MongoDB with relaxed TLS validation")
         return client
 
-client = _build_mongo_client()
-db = client[DATABASE_NAME]
-documents_collection = db['documents']
-communication_collection = db['adk_communication']
+# Connected on first request, not at import: spawned page-extraction workers
+# re-import this script as __mp_main__ and must not open Mongo connections.
+@lru_cache(maxsize=1)
+def _get_collections() -> Tuple[Collection, Collection]:
+    """Return (documents, adk_communication), connecting and indexing once."""
+    db = _build_mongo_client()[DATABASE_NAME]
+    documents = db['documents']
+    documents.create_index('document_id', unique=True, background=True)
+    return documents, db['adk_communication']
+
+# Fields returned by /get_result; everything else stays on the server
+_RESULT_PROJECTION = {
+    '_id': 0,
+    'document_id': 1,
+    'status': 1,
+    'processed_at': 1,
+    'clause_count': 1,
+    'high_risk_count': 1,
+    'overall_risk_score': 1,
+    'adk_a_result': 1,
+    'adk_b_response': 1,
+}
+
+# Short-lived cache for /get_result, invalidated whenever a document is rewritten
+RESULT_CACHE_TTL_SECONDS = 30.0
+RESULT_CACHE_MAX_ENTRIES = 1024
+_RESULT_CACHE: "OrderedDict[str, Tuple[float, str, Dict[str, Any]]]" = OrderedDict()
+_RESULT_CACHE_LOCK = threading.Lock()
+
+def _get_cached_result(document_id: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+    """Return (etag, body) for a cached result that has not expired"""
+    with _RESULT_CACHE_LOCK:
+        entry = _RESULT_CACHE.get(document_id)
+        if entry is None:
+            return None
+        expires_at, etag, body = entry
+        if expires_at < time.monotonic():
+            del _RESULT_CACHE[document_id]
+            return None
+        return etag, body
+
+def _cache_result(document_id: str, body: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+    """Store a result with a content-derived ETag and return (etag, body)"""
+    encoded = json.dumps(body, sort_keys=True, default=str).encode('utf-8')
+    etag = hashlib.blake2b(encoded, digest_size=8).hexdigest()
+    with _RESULT_CACHE_LOCK:
+        _RESULT_CACHE[document_id] = (time.monotonic() + RESULT_CACHE_TTL_SECONDS, etag, body)
+        _RESULT_CACHE.move_to_end(document_id)
+        while len(_RESULT_CACHE) > RESULT_CACHE_MAX_ENTRIES:
+            _RESULT_CACHE.popitem(last=False)
+    return etag, body
+
+def _invalidate_result(document_id: str) -> None:
+    with _RESULT_CACHE_LOCK:
+        _RESULT_CACHE.pop(document_id, None)
 
 @app.route('/health', methods=['GET'])
 def health_check():
@@ -84,21 +144,27 @@ def process_document():
             document_text=document_text,
             document_type=document_type
         )
-        markdown_report = build_adk_a_markdown_report(result)
-        result["markdown_report"] = markdown_report
-        persist_json_output("adk_a", document_id, result)
-        persist_markdown_output("adk_a", document_id, markdown_report)
+        # Dump the models once; the report, archive and MongoDB copy share it
+        plain_result = to_plain(result)
+        markdown_report = build_adk_a_markdown_report(plain_result)
+        result["markdown_report"] = plain_result["markdown_report"] = markdown_report
+        with persist_batch() as timestamp:
+            persist_json_output("adk_a", document_id, plain_result, timestamp=timestamp)
+            persist_markdown_output("adk_a", document_id, markdown_report, timestamp=timestamp)
+            persist_ndjson_output("adk_a_clauses", document_id, plain_result.get("extracted_clauses", []), timestamp=timestamp)
         
         # Store result in MongoDB
+        documents_collection, communication_collection = _get_collections()
         documents_collection.update_one(
             {'document_id': document_id},
             {'$set': {
-                'adk_a_result': serialize_payload(result),
+                'adk_a_result': plain_result,
                 'status': result['status'],
                 'processed_at': result['audit_log'][-1].timestamp if result.get('audit_log') else None
             }},
             upsert=True
         )
+        _invalidate_result(document_id)
         
         # If ready for suggestions, notify ADK-B
         if result.get('ready_for_suggestions'):
@@ -136,15 +202,24 @@ def \
     get_result(document_id):
     """Retrieve processing result for a document"""
     try:
-        result = documents_collection.find_one({'document_id': document_id})
-        
-        if not result:
-            return jsonify({'error': 'Document not found'}), 404
-        
-        # Remove MongoDB _id field
-        result.pop('_id', None)
+        cached = _get_cached_result(document_id)
+        if cached is None:
+            documents_collection, _ = _get_collections()
+            result = documents_collection.find_one(
+                {'document_id': document_id},
+                projection=_RESULT_PROJECTION
+            )
+            
+            if not result:
+                return jsonify({'error': 'Document not found'}), 404
+            
+            cached = _cache_result(document_id, result)
         
-        return jsonify(result), 200
+        etag, body = cached
+        response = jsonify(body)
+        response.set_etag(etag)
+        # Answers 304 Not Modified when If-None-Match matches the ETag
+        return response.make_conditional(request)
         
     except Exception as e:
         logger.error(f"Error retrieving result: {str(e)}")
@@ -159,6 +234,7 @@ def receive_communication():
         logger.info(f"Received communication from {data.get('from')}")
         
         # Store communication
+        documents_collection, communication_collection = _get_collections()
         communication_collection.insert_one(data)
         
         # Update document with ADK-B response
@@ -167,6 +243,7 @@ def receive_communication():
                 {'document_id': data['document_id']},
                 {'$set': {'adk_b_response': data.get('data')}}
             )
+            _invalidate_result(data['document_id'])
         
         return jsonify({'status': 'received'}), 200
         
@@ -176,4 +253,5 @@ def receive_communication():
 
 if __name__ == '__main__':
     logger.info(f"Starting ADK-A MCP Server on port {MCP_SERVER_A_PORT}")
+    _get_collections()
     app.run(host='0.0.0.0', port=MCP_SERVER_A_PORT, debug=False)
\ No newline at end of file
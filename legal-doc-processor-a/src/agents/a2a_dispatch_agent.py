@@ -1,19 +1,29 @@
+import asyncio
+import atexit
 import logging
 import time
 from datetime import datetime
-from typing import Any, Dict
+from functools import partial
+from typing import Any, Dict, Optional
 
 import requests
 
+try:
+    import httpx
+except ImportError:  # pragma: no cover - optional dependency
+    httpx = None
+
 from src.config import MCP_SERVER_B_URL, ENABLE_A2A_DISPATCH
 from src.monitoring.callbacks import monitor
 from src.state.shared_state import LegalDocumentState, AuditEntry
+from src.utils.event_loop import AsyncEventLoopThread
 
 logger = logging.getLogger(__name__)
 
 DISPATCH_TIMEOUT = (10, 180)  # (connect, read) seconds
 MAX_ATTEMPTS = 3
 BACKOFF_SECONDS = 5
+TRANSPORT_ERRORS = (requests.RequestException,) + ((httpx.HTTPError,) if httpx is not None else ())
 
 
 def _make_json_safe(value: Any) -> Any:
@@ -38,8 +48,55 @@ class A2ADispatchAgent:
     def __init__(self):
         self.name = "A2ADispatchAgent"
         self.session = requests.Session()
+        # Created lazily on the shared event loop, which owns all async dispatches
+        self.async_client = None
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
 
     def process(self, state: LegalDocumentState) -> LegalDocumentState:
+        """Sync entry point; runs process_async on the shared background loop"""
+        return AsyncEventLoopThread.instance().run_coroutine(self.process_async(state))
+
+    async def _post_json(self, endpoint: str, payload: Dict[str, Any]) -> Any:
+        if httpx is None:
+            # Without an async client, fall back to the blocking session on a worker thread
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                None,
+                partial(self.session.post, endpoint, json=payload, timeout=DISPATCH_TIMEOUT)
+            )
+        if self.async_client is None:
+            connect_timeout, read_timeout = DISPATCH_TIMEOUT
+            self.async_client = httpx.AsyncClient(
+                timeout=httpx.Timeout(read_timeout, connect=connect_timeout)
+            )
+            self._client_loop = asyncio.get_running_loop()
+            # Registered after the shared loop's own atexit close, so it runs first (LIFO)
+            atexit.register(self.close)
+        return await self.async_client.post(endpoint, json=payload)
+
+    async def aclose(self) -> None:
+        """Close the async HTTP client, if one was created"""
+        client, self.async_client = self.async_client, None
+        if client is not None:
+            await client.aclose()
+
+    def close(self) -> None:
+        """Sync shutdown: run aclose() on the loop that owns the client while it is still running"""
+        loop = self._client_loop
+        if self.async_client is None or loop is None or not loop.is_running():
+            return
+        try:
+            if asyncio.get_running_loop() is loop:
+                loop.create_task(self.aclose())
+                return
+        except RuntimeError:
+            pass
+        try:
+            asyncio.run_coroutine_threadsafe(self.aclose(), loop).result(timeout=5)
+        except Exception as exc:
+            logger.debug("Closing the A2A HTTP client failed: %s", exc)
+
+    async def process_async(self, state: LegalDocumentState) -> LegalDocumentState:
         context = monitor.on_agent_start(self.name, {"document_id": state["document_id"]})
         try:
             if not ENABLE_A2A_DISPATCH:
@@ -65,13 +122,9 @@ class A2ADispatchAgent:
 
             for attempt in range(1, MAX_ATTEMPTS + 1):
                 try:
-                    response = self.session.post(
-                        endpoint,
-                        json=safe_payload,
-                        timeout=DISPATCH_TIMEOUT
-                    )
+                    response = await self._post_json(endpoint, safe_payload)
                     break
-                except requests.RequestException as exc:
+                except TRANSPORT_ERRORS as exc:
                     last_error = exc
                     logger.warning(
                         "Dispatch attempt %s/%s to ADK-B failed: %s",
@@ -83,7 +136,7 @@ class A2ADispatchAgent:
                         f"Dispatch attempt {attempt} failed: {exc}"
                     )
                     if attempt < MAX_ATTEMPTS:
-                        time.sleep(BACKOFF_SECONDS * attempt)
+                        await asyncio.sleep(BACKOFF_SECONDS * attempt)
 
             if response is None:
                 warning_msg = (
@@ -106,7 +159,8 @@ class A2ADispatchAgent:
                 )
                 return state
 
-            if response.ok:
+            # requests' Response.ok semantics, which httpx responses lack
+            if response.status_code < 400:
                 state["adk_b_response"] = response.json()
                 state.setdefault("planning_notes", []).append("ADK-B suggestions requested via MCP portal")
                 state["status"] = "completed"
@@ -123,7 +177,7 @@ class A2ADispatchAgent:
                 input_data={"endpoint": MCP_SERVER_B_URL},
                 output_data={"response_code": response.status_code if response else None},
                 model_used="http",
-                execution_time_ms=(datetime.now() - context["timestamp"]).total_seconds() * 1000
+                execution_time_ms=(time.perf_counter_ns() - context["perf_start"]) / 1e6
             )
             state.setdefault("audit_log", []).append(audit_entry)
             monitor.on_agent_end(context, {"response_code": response.status_code if response else None}, "a2a")
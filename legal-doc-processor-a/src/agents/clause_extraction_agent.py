@@ -1,22 +1,48 @@
-import google.generativeai as genai
 from src.state.shared_state import LegalDocumentState, Clause, AuditEntry
 from src.config import GEMINI_MODEL_STANDARD, GEMINI_MODEL_COMPLEX, GEMINI_API_KEY
-from src.utils.llm import generate_with_retry
+from src.utils.llm import generate_with_retry, get_model
 from src.monitoring.callbacks import monitor
 from datetime import datetime
 import json
 import re
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
+# Static prompt scaffolding, joined around the document excerpt at call time
+_CLAUSE_TEXT_LIMIT = 8000  # Limit to avoid token limits
+_CLAUSE_PROMPT_HEAD = """You are a legal document analyzer. Extract all important legal clauses from the following document.
+
+For each clause, identify:
+1. Type (e.g., indemnification, liability, payment, termination, confidentiality, jurisdiction, warranties, etc.)
+2. The full text of the clause
+3. Location in the document (section/paragraph reference)
+4. Your confidence in the classification (0.0 to 1.0)
+
+Document text:
+"""
+_CLAUSE_PROMPT_TAIL = """
+
+Return ONLY a valid JSON array of clauses, with no other text. Format:
+[
+  {
+    "id": "clause_1",
+    "type": "indemnification",
+    "text": "Full clause text...",
+    "location": "Section 5.2",
+    "confidence": 0.95
+  }
+]
+"""
+
 class ClauseExtractionAgent:
     """Agent 2: Extract and classify legal clauses"""
     
     def __init__(self):
         self.name = "ClauseExtractionAgent"
-        self.standard_model = genai.GenerativeModel(GEMINI_MODEL_STANDARD)
-        self.complex_model = genai.GenerativeModel(GEMINI_MODEL_COMPLEX)
+        self.standard_model = get_model(GEMINI_MODEL_STANDARD)
+        self.complex_model = get_model(GEMINI_MODEL_COMPLEX)
         self.llm_enabled = bool(GEMINI_API_KEY)
     
     def process(self, state: LegalDocumentState) -> LegalDocumentState:
@@ -40,28 +66,7 @@ class ClauseExtractionAgent:
             
             clauses_data = []
             if use_llm:
-                prompt = f"""You are a legal document analyzer. Extract all important legal clauses from the following document.
-
-For each clause, identify:
-1. Type (e.g., indemnification, liability, payment, termination, confidentiality, jurisdiction, warranties, etc.)
-2. The full text of the clause
-3. Location in the document (section/paragraph reference)
-4. Your confidence in the classification (0.0 to 1.0)
-
-Document text:
-{text[:8000]}  # Limit to avoid token limits
-
-Return ONLY a valid JSON array of clauses, with no other text. Format:
-[
-  {{
-    "id": "clause_1",
-    "type": "indemnification",
-    "text": "Full clause text...",
-    "location": "Section 5.2",
-    "confidence": 0.95
-  }}
-]
-"""
+                prompt = "".join((_CLAUSE_PROMPT_HEAD, text[:_CLAUSE_TEXT_LIMIT], _CLAUSE_PROMPT_TAIL))
             
                 try:
                     response = generate_with_retry(model, prompt)
@@ -113,7 +118,7 @@ Return ONLY a valid JSON array of clauses, with no other text. Format:
                     'clause_types': list(set(c.type for c in extracted_clauses))
                 },
                 model_used=model_name,
-                execution_time_ms=(datetime.now() - context['timestamp']).total_seconds() * 1000
+                execution_time_ms=(time.perf_counter_ns() - context['perf_start']) / 1e6
             )
             
             state.setdefault('audit_log', []).append(audit_entry)
@@ -3,7 +3,9 @@ from src.tools.pdf_parser import DocumentParser
 from src.monitoring.callbacks import monitor
 from datetime import datetime
 from collections import Counter
+import asyncio
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
@@ -14,6 +16,10 @@ class DocumentIngestionAgent:
         self.parser = DocumentParser()
         self.name = "DocumentIngestionAgent"
     
+    async def aprocess(self, state: LegalDocumentState) -> LegalDocumentState:
+        """Async node entry point; parsing is blocking file I/O, so it runs in a worker thread"""
+        return await asyncio.to_thread(self.process, state)
+    
     def process(self, state: LegalDocumentState) -> LegalDocumentState:
         """Parse document and extract metadata"""
         context = monitor.on_agent_start(self.name, {
@@ -72,7 +78,7 @@ class DocumentIngestionAgent:
                     'complexity': complexity
                 },
                 model_used="DocumentParser",
-                execution_time_ms=(datetime.now() - context['timestamp']).total_seconds() * 1000
+                execution_time_ms=(time.perf_counter_ns() - context['perf_start']) / 1e6
             )
             
             if 'audit_log' not in state:
@@ -1,24 +1,30 @@
 import logging
+import time
 from datetime import datetime
-from typing import List
-import google.generativeai as genai
+from typing import List, Optional
 from src.state.shared_state import LegalDocumentState, AuditEntry
 from src.monitoring.callbacks import monitor
 from src.config import GEMINI_MODEL_STANDARD, GEMINI_MODEL_COMPLEX, GEMINI_API_KEY
-from src.utils.llm import generate_with_retry
+from src.utils.llm import generate_with_retry, get_model
 
 logger = logging.getLogger(__name__)
 
+_SUMMARY_TEXT_LIMIT = 6000
+_SUMMARY_PROMPT_HEAD = (
+    "Produce a structured summary with sections: outline (bullet list), "
+    "entities (parties, regulators), and obligations. Keep under 200 words.\n"
+)
+
 class MetadataSummaryAgent:
     """Summarize document structure & provide outline"""
 
     def __init__(self):
         self.name = "MetadataSummaryAgent"
-        self.flash_model = genai.GenerativeModel(GEMINI_MODEL_STANDARD)
-        self.pro_model = genai.GenerativeModel(GEMINI_MODEL_COMPLEX)
+        self.flash_model = get_model(GEMINI_MODEL_STANDARD)
+        self.pro_model = get_model(GEMINI_MODEL_COMPLEX)
         self.llm_enabled = bool(GEMINI_API_KEY)
 
-    def process(self, state: LegalDocumentState) -> LegalDocumentState:
+    def process(self, state: LegalDocumentState, prefetched_summary: Optional[dict] = None) -> LegalDocumentState:
         context = monitor.on_agent_start(self.name, {
             "document_id": state["document_id"],
             "strategy": state.get("processing_strategy", "standard")
@@ -26,12 +32,12 @@ class MetadataSummaryAgent:
         try:
             strategy = state.get("processing_strategy", "standard")
             text = state.get("parsed_text", "")
-            summary = self._generate_summary(text, strategy)
+            summary = prefetched_summary or self._generate_summary(text, strategy)
             outline = summary.get("outline", [])
 
             state["metadata_summary"] = summary
             state["document_outline"] = outline
-            state["key_entities"] = list(dict.fromkeys(state.get("key_entities", []) + summary.get("entities", [])))
+            state["key_entities"] = self._merge_entities(state.get("key_entities", ()), summary.get("entities", ()))
 
             audit_entry = AuditEntry(
                 timestamp=datetime.now(),
@@ -40,7 +46,7 @@ class MetadataSummaryAgent:
                 input_data={"strategy": strategy, "text_length": len(text)},
                 output_data={"outline_len": len(outline), "entities": summary.get("entities", [])},
                 model_used=summary.get("model_used", "local"),
-                execution_time_ms=(datetime.now() - context["timestamp"]).total_seconds() * 1000
+                execution_time_ms=(time.perf_counter_ns() - context["perf_start"]) / 1e6
             )
             state.setdefault("audit_log", []).append(audit_entry)
 
@@ -53,6 +59,27 @@ class MetadataSummaryAgent:
             state.setdefault("errors", []).append(f"{self.name}: {exc}")
         return state
 
+    @staticmethod
+    def _merge_entities(existing, discovered) -> List[str]:
+        """Order-preserving union of entity lists without building a temporary concatenation."""
+        seen = set()
+        merged = []
+        for entity in existing:
+            if entity not in seen:
+                seen.add(entity)
+                merged.append(entity)
+        for entity in discovered:
+            if entity not in seen:
+                seen.add(entity)
+                merged.append(entity)
+        return merged
+
+    def prefetch_summary(self, text: str, strategy: str) -> Optional[dict]:
+        """Compute the summary ahead of time when it needs no LLM call; None otherwise"""
+        if text and (strategy == "standard" or not self.llm_enabled):
+            return self._keyword_summary(text)
+        return None
+
     def _generate_summary(self, text: str, strategy: str) -> dict:
         if not text:
             return {
@@ -66,11 +93,7 @@ class MetadataSummaryAgent:
             return self._keyword_summary(text)
 
         # Use LLM for advanced strategy
-        prompt = (
-            "Produce a structured summary with sections: outline (bullet list), "
-            "entities (parties, regulators), and obligations. Keep under 200 words.\n" +
-            text[:6000]
-        )
+        prompt = _SUMMARY_PROMPT_HEAD + text[:_SUMMARY_TEXT_LIMIT]
         model = self.pro_model if strategy == "advanced" else self.flash_model
         response = generate_with_retry(model, prompt)
         outline = [line.strip("- ") for line in response.text.splitlines() if line.strip()]
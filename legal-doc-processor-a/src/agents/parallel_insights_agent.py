@@ -1,10 +1,11 @@
 import asyncio
-import copy
 import logging
+import os
 import threading
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
-from typing import Any, Dict, List, Mapping, Tuple
+from typing import Any, Dict, List, Mapping, Optional, Tuple
 
 from src.agents.clause_extraction_agent import ClauseExtractionAgent
 from src.agents.metadata_summary_agent import MetadataSummaryAgent
@@ -12,10 +13,28 @@ from src.agents.risk_detection_agent import RiskDetectionAgent
 from src.agents.a2a_dispatch_agent import A2ADispatchAgent
 from src.monitoring.callbacks import monitor
 from src.state.shared_state import LegalDocumentState, AuditEntry
-from src.config import FORCE_SEQUENTIAL_EXECUTION
+from src.state.cow_state import CopyOnWriteDict
+from src.config import CONFIG
+from src.utils.event_loop import AsyncEventLoopThread
 
 logger = logging.getLogger(__name__)
 
+# (task label, keys copied when present, keys copied when truthy, list keys extended)
+_MERGE_PLAN = (
+    ("clauses", ("extracted_clauses", "clause_count"), (), ()),
+    ("summary", ("metadata_summary", "document_outline", "key_entities"), (), ()),
+    (
+        "risk",
+        (
+            "risk_assessments", "high_risk_count", "overall_risk_score", "recommendation_trace",
+            "context_bundle", "ready_for_suggestions", "cost_spent",
+        ),
+        ("status",),
+        ("planning_notes", "errors"),
+    ),
+    ("suggestion", (), ("adk_b_response", "status"), ("planning_notes", "errors")),
+)
+
 class ParallelInsightsAgent:
     """Agent 3: Orchestrate clause, summary, risk, and suggestion tasks concurrently"""
 
@@ -25,139 +44,173 @@ class ParallelInsightsAgent:
         self.summary_agent = MetadataSummaryAgent()
         self.risk_agent = RiskDetectionAgent()
         self.dispatch_agent = A2ADispatchAgent()
+        # Sized to the LLM concurrency so branch threads never outnumber allowed API calls
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(int(os.getenv("PIA_EXECUTOR_WORKERS", str(CONFIG.llm_concurrency))), 1),
+            thread_name_prefix="pia"
+        )
+        # Sequential runs block for a whole document (including run_coroutine calls
+        # into the shared loop), so they get their own threads rather than the
+        # default executor that loop-side work depends on
+        self._sequential_executor = ThreadPoolExecutor(
+            max_workers=max(int(os.getenv("PIA_SEQUENTIAL_WORKERS", "4")), 1),
+            thread_name_prefix="pia-seq"
+        )
+        # Prefetch (RAG index load, keyword summary) gets its own threads so it
+        # never occupies branch slots in the LLM-sized pool above
+        self._prefetch_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="pia-prefetch")
+        # document_id -> {prefetch key: future}, filled by prefetch() during planning
+        self._prefetched: Dict[str, Dict[str, Future]] = {}
+        self._prefetch_lock = threading.Lock()
+
+    def prefetch(self, state: LegalDocumentState) -> None:
+        """Start LLM-free prework (RAG index load, keyword summary) ahead of process()"""
+        futures: Dict[str, Future] = {}
+        if self.risk_agent.llm_enabled:
+            futures["rag"] = self._prefetch_executor.submit(self.risk_agent.rag_retriever.load_dataset)
+        futures["summary"] = self._prefetch_executor.submit(
+            self.summary_agent.prefetch_summary,
+            state.get("parsed_text", ""),
+            state.get("processing_strategy", "standard")
+        )
+        with self._prefetch_lock:
+            self._prefetched[state["document_id"]] = futures
+
+    def _take_prefetch(self, document_id: str, key: str) -> Optional[Any]:
+        """Pop a prefetched result, waiting if it is still running; None if absent or failed"""
+        with self._prefetch_lock:
+            future = self._prefetched.get(document_id, {}).pop(key, None)
+        if future is None:
+            return None
+        try:
+            return future.result()
+        except Exception as exc:
+            logger.warning("Prefetch %s failed for %s: %s", key, document_id, exc)
+            return None
+
+    def close(self) -> None:
+        """Shut down the branch, prefetch and risk-batch thread pools and the A2A HTTP client"""
+        self._prefetch_executor.shutdown(wait=True, cancel_futures=True)
+        self._sequential_executor.shutdown(wait=True)
+        self._executor.shutdown(wait=True)
+        self.risk_agent.close()
+        self.dispatch_agent.close()
 
     def process(self, state: LegalDocumentState) -> LegalDocumentState:
-        context = monitor.on_agent_start(self.name, {
+        context = self._start(state)
+        try:
+            results, task_errors = self._run_parallel_execution(state)
+            self._merge_results(state, context, results, task_errors)
+        except Exception as exc:
+            self._fail(state, context, exc)
+        finally:
+            self._discard_prefetch(state)
+        return state
+
+    async def aprocess(self, state: LegalDocumentState) -> LegalDocumentState:
+        """Async node entry point; awaits the branches on the caller's event loop"""
+        context = self._start(state)
+        try:
+            if CONFIG.force_sequential:
+                logger.info("Running tasks sequentially to avoid rate limits")
+                # Sequential branches block, so keep them off the event loop thread
+                loop = asyncio.get_running_loop()
+                results, task_errors = await loop.run_in_executor(
+                    self._sequential_executor, self._execute_sequential_tasks, state
+                )
+            else:
+                results, task_errors = await self._execute_parallel_tasks(state)
+            self._merge_results(state, context, results, task_errors)
+        except Exception as exc:
+            self._fail(state, context, exc)
+        finally:
+            self._discard_prefetch(state)
+        return state
+
+    def _start(self, state: LegalDocumentState) -> Dict[str, Any]:
+        return monitor.on_agent_start(self.name, {
             "document_id": state["document_id"],
             "strategy": state.get("processing_strategy", "standard")
         })
 
-        try:
-            results, task_errors = self._run_parallel_execution(state)
-
-            for label, exc in task_errors:
-                logger.error("Concurrent task %s failed: %s", label, exc)
-                state.setdefault("errors", []).append(f"{label}_task: {exc}")
-
-            clause_state = results.get("clauses") or {}
-            summary_state = results.get("summary") or {}
-            risk_state = results.get("risk") or {}
-            suggestion_state = results.get("suggestion") or {}
-
-            if clause_state:
-                state["extracted_clauses"] = clause_state.get("extracted_clauses", [])
-                state["clause_count"] = clause_state.get("clause_count", 0)
-                self._extend_audit_log(state, clause_state)
-
-            if summary_state:
-                state["metadata_summary"] = summary_state.get("metadata_summary", state.get("metadata_summary", {}))
-                state["document_outline"] = summary_state.get("document_outline", [])
-                state["key_entities"] = summary_state.get("key_entities", state.get("key_entities", []))
-                self._extend_audit_log(state, summary_state)
-
-            if risk_state:
-                if "risk_assessments" in risk_state:
-                    state["risk_assessments"] = risk_state.get("risk_assessments", [])
-                if "high_risk_count" in risk_state:
-                    state["high_risk_count"] = risk_state.get("high_risk_count", 0)
-                if "overall_risk_score" in risk_state:
-                    state["overall_risk_score"] = risk_state.get("overall_risk_score", 0.0)
-                if "recommendation_trace" in risk_state:
-                    state["recommendation_trace"] = risk_state.get("recommendation_trace", [])
-                if "context_bundle" in risk_state:
-                    state["context_bundle"] = risk_state.get("context_bundle", {})
-                if "ready_for_suggestions" in risk_state:
-                    state["ready_for_suggestions"] = risk_state.get("ready_for_suggestions", False)
-                if "cost_spent" in risk_state:
-                    state["cost_spent"] = risk_state.get("cost_spent", state.get("cost_spent", 0.0))
-                if risk_state.get("planning_notes"):
-                    state.setdefault("planning_notes", []).extend(risk_state["planning_notes"])
-                if risk_state.get("status"):
-                    state["status"] = risk_state["status"]
-                if risk_state.get("errors"):
-                    state.setdefault("errors", []).extend(risk_state["errors"])
-                self._extend_audit_log(state, risk_state)
-
-            if suggestion_state:
-                if suggestion_state.get("planning_notes"):
-                    state.setdefault("planning_notes", []).extend(suggestion_state["planning_notes"])
-                if suggestion_state.get("adk_b_response"):
-                    state["adk_b_response"] = suggestion_state["adk_b_response"]
-                if suggestion_state.get("status"):
-                    state["status"] = suggestion_state["status"]
-                if suggestion_state.get("errors"):
-                    state.setdefault("errors", []).extend(suggestion_state["errors"])
-                self._extend_audit_log(state, suggestion_state)
-
-            parallel_audit = AuditEntry(
-                timestamp=datetime.now(),
-                agent_name=self.name,
-                action="parallel_insights",
-                input_data={
-                    "strategy": state.get("processing_strategy"),
-                    "tasks": ["clause_extraction", "metadata_summary", "risk_detection", "suggestion_dispatch"]
-                },
-                output_data={
-                    "clause_count": state.get("clause_count", 0),
-                    "high_risk_count": state.get("high_risk_count", 0),
-                    "ready_for_suggestions": state.get("ready_for_suggestions", False)
-                },
-                model_used="parallel_executor",
-                execution_time_ms=(datetime.now() - context["timestamp"]).total_seconds() * 1000
-            )
-            state.setdefault("audit_log", []).append(parallel_audit)
-
-            monitor.on_agent_end(context, {
+    def _fail(self, state: LegalDocumentState, context: Dict[str, Any], exc: Exception) -> None:
+        logger.error("Parallel insights failed: %s", exc)
+        monitor.on_agent_error(context, exc)
+        state.setdefault("errors", []).append(f"{self.name}: {exc}")
+
+    def _discard_prefetch(self, state: LegalDocumentState) -> None:
+        with self._prefetch_lock:
+            self._prefetched.pop(state["document_id"], None)
+
+    def _merge_results(
+        self,
+        state: LegalDocumentState,
+        context: Dict[str, Any],
+        results: Dict[str, LegalDocumentState],
+        task_errors: List[Tuple[str, BaseException]]
+    ) -> None:
+        for label, exc in task_errors:
+            logger.error("Concurrent task %s failed: %s", label, exc)
+            state.setdefault("errors", []).append(f"{label}_task: {exc}")
+
+        for label, copy_keys, truthy_keys, extend_keys in _MERGE_PLAN:
+            source_state = results.get(label)
+            if not source_state:
+                continue
+            for key in copy_keys:
+                if key in source_state:
+                    state[key] = source_state[key]
+            for key in truthy_keys:
+                value = source_state.get(key)
+                if value:
+                    state[key] = value
+            for key in extend_keys:
+                value = source_state.get(key)
+                if value:
+                    state.setdefault(key, []).extend(value)
+            self._extend_audit_log(state, source_state)
+
+        parallel_audit = AuditEntry(
+            timestamp=datetime.now(),
+            agent_name=self.name,
+            action="parallel_insights",
+            input_data={
+                "strategy": state.get("processing_strategy"),
+                "tasks": ["clause_extraction", "metadata_summary", "risk_detection", "suggestion_dispatch"]
+            },
+            output_data={
                 "clause_count": state.get("clause_count", 0),
                 "high_risk_count": state.get("high_risk_count", 0),
-                "adk_b_response": bool(state.get("adk_b_response"))
-            }, "parallel_executor")
-        except Exception as exc:
-            logger.error("Parallel insights failed: %s", exc)
-            monitor.on_agent_error(context, exc)
-            state.setdefault("errors", []).append(f"{self.name}: {exc}")
-        return state
+                "ready_for_suggestions": state.get("ready_for_suggestions", False)
+            },
+            model_used="parallel_executor",
+            execution_time_ms=(time.perf_counter_ns() - context["perf_start"]) / 1e6
+        )
+        state.setdefault("audit_log", []).append(parallel_audit)
+
+        monitor.on_agent_end(context, {
+            "clause_count": state.get("clause_count", 0),
+            "high_risk_count": state.get("high_risk_count", 0),
+            "adk_b_response": bool(state.get("adk_b_response"))
+        }, "parallel_executor")
 
     def _run_parallel_execution(self, state: LegalDocumentState) -> Tuple[Dict[str, LegalDocumentState], List[Tuple[str, BaseException]]]:
         """Execute async workflow even when caller already runs an event loop."""
         
         # Force sequential execution to avoid concurrent API calls that trigger 429
-        if FORCE_SEQUENTIAL_EXECUTION:
+        if CONFIG.force_sequential:
             logger.info("Running tasks sequentially to avoid rate limits")
             return self._execute_sequential_tasks(state)
 
-        coroutine = self._execute_parallel_tasks(state)
-        try:
-            asyncio.get_running_loop()
-        except RuntimeError:
-            return asyncio.run(coroutine)
-
-        return self._run_coroutine_in_thread(coroutine)
-
-    @staticmethod
-    def _run_coroutine_in_thread(coroutine: Any) -> Any:
-        result_container: Dict[str, Any] = {}
-        error: List[BaseException] = []
-
-        def runner() -> None:
-            new_loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(new_loop)
-            try:
-                result_container["value"] = new_loop.run_until_complete(coroutine)
-            except BaseException as exc:  # Capture any exception to raise in caller thread
-                error.append(exc)
-            finally:
-                new_loop.close()
-
-        thread = threading.Thread(target=runner, daemon=True)
-        thread.start()
-        thread.join()
-
-        if error:
-            raise error[0]
-        return result_container["value"]
+        # The shared background loop works whether or not the caller already runs a loop
+        return AsyncEventLoopThread.instance().run_coroutine(self._execute_parallel_tasks(state))
 
     async def _execute_parallel_tasks(self, state: LegalDocumentState) -> Tuple[Dict[str, LegalDocumentState], List[Tuple[str, BaseException]]]:
+        """Run every branch to completion and collect per-branch results and errors.
+
+        Branches run as executor threads, which cannot be interrupted once started,
+        so a failing branch must not discard results its siblings already produced.
+        """
         clause_task = asyncio.create_task(self._run_clause_task_async(state))
         summary_task = asyncio.create_task(self._run_summary_task_async(state))
         risk_task = asyncio.create_task(self._run_risk_task_async(state, clause_task))
@@ -170,46 +223,55 @@ class ParallelInsightsAgent:
             ("suggestion", suggestion_task)
         ]
 
-        gathered = await asyncio.gather(*(task for _, task in task_order), return_exceptions=True)
+        await asyncio.gather(*(task for _, task in task_order), return_exceptions=True)
+        return self._collect_task_outcomes(task_order)
 
+    @staticmethod
+    def _collect_task_outcomes(task_order: List[Tuple[str, "asyncio.Task[LegalDocumentState]"]]) -> Tuple[Dict[str, LegalDocumentState], List[Tuple[str, BaseException]]]:
         results: Dict[str, LegalDocumentState] = {}
         errors: List[Tuple[str, BaseException]] = []
-        for (label, _), outcome in zip(task_order, gathered):
-            if isinstance(outcome, BaseException):
-                errors.append((label, outcome))
+        for label, task in task_order:
+            if task.cancelled():
+                errors.append((label, asyncio.CancelledError(f"{label} task was cancelled")))
+            elif task.exception() is not None:
+                errors.append((label, task.exception()))
             else:
-                results[label] = outcome
+                results[label] = task.result()
 
         return results, errors
 
     async def _run_clause_task_async(self, state: LegalDocumentState) -> LegalDocumentState:
         loop = asyncio.get_running_loop()
-        return await loop.run_in_executor(None, self._run_clause_task, state)
+        return await loop.run_in_executor(self._executor, self._run_clause_task, state)
 
     async def _run_summary_task_async(self, state: LegalDocumentState) -> LegalDocumentState:
         loop = asyncio.get_running_loop()
-        return await loop.run_in_executor(None, self._run_summary_task, state)
+        return await loop.run_in_executor(self._executor, self._run_summary_task, state)
 
     async def _run_risk_task_async(self, state: LegalDocumentState, clause_task: "asyncio.Task[LegalDocumentState]") -> LegalDocumentState:
         clause_state = await clause_task
         loop = asyncio.get_running_loop()
-        return await loop.run_in_executor(None, self._run_risk_task, state, clause_state)
+        return await loop.run_in_executor(self._executor, self._run_risk_task, state, clause_state)
 
     async def _run_suggestion_task_async(self, risk_task: "asyncio.Task[LegalDocumentState]") -> LegalDocumentState:
         risk_state = await risk_task
         if not risk_state:
             return risk_state
-        loop = asyncio.get_running_loop()
-        return await loop.run_in_executor(None, self._run_suggestion_task, risk_state)
+        return await self.dispatch_agent.process_async(risk_state)
 
+    # Sub-agents get copy-on-write views: they only reassign or append to top-level
+    # keys, so sharing the rest of the state by reference is safe and avoids deepcopy.
     def _run_clause_task(self, state: LegalDocumentState) -> LegalDocumentState:
-        return self.clause_agent.process(copy.deepcopy(state))
+        return self.clause_agent.process(CopyOnWriteDict(state))
 
     def _run_summary_task(self, state: LegalDocumentState) -> LegalDocumentState:
-        return self.summary_agent.process(copy.deepcopy(state))
+        prefetched_summary = self._take_prefetch(state["document_id"], "summary")
+        return self.summary_agent.process(CopyOnWriteDict(state), prefetched_summary)
 
     def _run_risk_task(self, state: LegalDocumentState, clause_state: LegalDocumentState):
-        merged_state = copy.deepcopy(state)
+        # Let an in-flight prefetch finish loading the RAG dataset rather than loading it twice
+        self._take_prefetch(state["document_id"], "rag")
+        merged_state = CopyOnWriteDict(state)
         if clause_state:
             merged_state["extracted_clauses"] = clause_state.get("extracted_clauses", [])
             merged_state["clause_count"] = clause_state.get("clause_count", 0)
@@ -221,14 +283,13 @@ class ParallelInsightsAgent:
         return self.dispatch_agent.process(risk_state)
 
     def _execute_sequential_tasks(self, state: LegalDocumentState) -> Tuple[Dict[str, LegalDocumentState], List[Tuple[str, BaseException]]]:
-        """Execute tasks one by one to avoid hitting rate limits."""
+        """Execute tasks one by one; generate_with_retry paces the LLM calls themselves."""
         results: Dict[str, LegalDocumentState] = {}
         errors: List[Tuple[str, BaseException]] = []
         
         try:
             logger.info("[Sequential] Running clause extraction...")
             results["clauses"] = self._run_clause_task(state)
-            time.sleep(15)  # 15 second delay between tasks to prevent 429 errors
         except Exception as e:
             errors.append(("clauses", e))
             logger.error(f"Clause extraction failed: {e}")
@@ -237,7 +298,6 @@ class ParallelInsightsAgent:
         try:
             logger.info("[Sequential] Running metadata summary...")
             results["summary"] = self._run_summary_task(state)
-            time.sleep(15)
         except Exception as e:
             errors.append(("summary", e))
             logger.error(f"Metadata summary failed: {e}")
@@ -247,7 +307,6 @@ class ParallelInsightsAgent:
             logger.info("[Sequential] Running risk detection...")
             clause_state = results.get("clauses", state)
             results["risk"] = self._run_risk_task(state, clause_state)
-            time.sleep(15)
         except Exception as e:
             errors.append(("risk", e))
             logger.error(f"Risk detection failed: {e}")
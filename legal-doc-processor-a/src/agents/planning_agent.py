@@ -1,16 +1,23 @@
 from datetime import datetime
-from typing import Dict
+from typing import Callable, Dict, Optional
 from src.state.shared_state import LegalDocumentState, AuditEntry
 from src.monitoring.callbacks import monitor
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
 class PlanningAgent:
     """Agent 2: Dynamically plan the pipeline and model routing"""
 
-    def __init__(self):
+    def __init__(self, prefetch: Optional[Callable[[LegalDocumentState], None]] = None):
         self.name = "PlanningAgent"
+        # Downstream hook that starts LLM-free prework while planning finishes
+        self.prefetch = prefetch
+
+    async def aprocess(self, state: LegalDocumentState) -> LegalDocumentState:
+        """Async node entry point; planning is quick in-memory work, so it runs inline"""
+        return self.process(state)
 
     def process(self, state: LegalDocumentState) -> LegalDocumentState:
         context = monitor.on_agent_start(self.name, {
@@ -40,6 +47,12 @@ class PlanningAgent:
             ]
             state["parallel_tasks"] = ["clause_extraction", "metadata_summary"]
 
+            if self.prefetch is not None:
+                try:
+                    self.prefetch(state)
+                except Exception as prefetch_exc:
+                    logger.warning("Prefetch failed to start: %s", prefetch_exc)
+
             audit_entry = AuditEntry(
                 timestamp=datetime.now(),
                 agent_name=self.name,
@@ -55,7 +68,7 @@ class PlanningAgent:
                     "cost_budget": cost_budget
                 },
                 model_used="planning_heuristics",
-                execution_time_ms=(datetime.now() - context["timestamp"]).total_seconds() * 1000
+                execution_time_ms=(time.perf_counter_ns() - context["perf_start"]) / 1e6
             )
             state.setdefault("audit_log", []).append(audit_entry)
 
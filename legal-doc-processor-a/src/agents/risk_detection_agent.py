@@ -1,28 +1,58 @@
-import google.generativeai as genai
-from src.state.shared_state import LegalDocumentState, RiskAssessment, AuditEntry
-from src.config import GEMINI_MODEL_STANDARD, GEMINI_MODEL_COMPLEX, GEMINI_API_KEY
+from pydantic import TypeAdapter
+from src.state.shared_state import LegalDocumentState, Clause, RiskAssessment, AuditEntry
+from src.config import GEMINI_MODEL_STANDARD, GEMINI_MODEL_COMPLEX, GEMINI_API_KEY, LLM_CONCURRENCY, RISK_BATCH_SIZE
 from src.tools.rag_retriever import RAGRetriever
 from src.monitoring.callbacks import monitor
-from src.utils.llm import generate_with_retry
+from src.utils.llm import generate_with_retry, get_model
+from src.utils.event_loop import AsyncEventLoopThread
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Tuple
+import asyncio
 import json
 import re
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
+_JSON_FENCE_HEAD = re.compile(r'^```json\s*')
+_JSON_FENCE_TAIL = re.compile(r'\s*```$')
+
+# Serialize whole lists in one pydantic-core call instead of per-model .dict()
+_CLAUSES_ADAPTER = TypeAdapter(List[Clause])
+_RISK_ADAPTER = TypeAdapter(List[RiskAssessment])
+_AUDIT_ADAPTER = TypeAdapter(List[AuditEntry])
+
 class RiskDetectionAgent:
     """Agent 3: Assess risk level of extracted clauses"""
     
     def __init__(self):
         self.name = "RiskDetectionAgent"
-        self.standard_model = genai.GenerativeModel(GEMINI_MODEL_STANDARD)
-        self.complex_model = genai.GenerativeModel(GEMINI_MODEL_COMPLEX)
+        self.standard_model = get_model(GEMINI_MODEL_STANDARD)
+        self.complex_model = get_model(GEMINI_MODEL_COMPLEX)
         self.rag_retriever = RAGRetriever()
         self.llm_enabled = bool(GEMINI_API_KEY)
+        # Dedicated pool for blocking batch calls. process() may itself run on a
+        # default-executor thread, so batches must not queue behind it there.
+        self._batch_executor = ThreadPoolExecutor(max_workers=LLM_CONCURRENCY, thread_name_prefix="risk-batch")
+
+    def close(self) -> None:
+        """Shut down the risk-batch thread pool"""
+        self._batch_executor.shutdown(wait=True)
     
     def process(self, state: LegalDocumentState) -> LegalDocumentState:
         """Assess risks for each extracted clause"""
+        if not state.get('extracted_clauses'):
+            # Nothing to assess: skip monitoring, RAG warm-up and the audit entry
+            logger.info("No clauses extracted; skipping risk assessment")
+            state['risk_assessments'] = []
+            state['high_risk_count'] = 0
+            state['overall_risk_score'] = 0.0
+            state['ready_for_suggestions'] = False
+            state['context_bundle'] = {}
+            return state
+
         context = monitor.on_agent_start(self.name, {
             'document_id': state['document_id'],
             'clause_count': state.get('clause_count', 0)
@@ -43,67 +73,18 @@ class RiskDetectionAgent:
             
             recommendation_trace = state.get('recommendation_trace', [])
 
-            for clause in clauses:
-                try:
-                    # Get relevant precedents from RAG
-                    similar_clauses = self.rag_retriever.retrieve_similar_clauses(
-                        clause.text,
-                        top_k=2
-                    )
-                    risk_context = self.rag_retriever.get_risk_context(clause.type)
-                    
-                    monitor.log_intermediate_output(
-                        self.name,
-                        f"rag_retrieval_{clause.id}",
-                        f"Found {len(similar_clauses)} similar clauses"
-                    )
-                    
-                    use_llm = self.llm_enabled and bool(clause.text.strip())
-                    model_used = 'heuristic_risk'
-                    if use_llm:
-                        prompt = f"""You are a legal risk analyst. Assess the risk of this clause.
-
-Clause ID: {clause.id}
-Clause Type: {clause.type}
-Clause Text: {clause.text}
-
-Similar Precedents:
-{json.dumps([c['text'][:200] for c in similar_clauses], indent=2)}
-
-Known Risks for {clause.type}:
-{json.dumps(risk_context.get('common_risks', []), indent=2)}
-
-Assess:
-1. Risk Level (LOW, MEDIUM, HIGH, or CRITICAL)
-2. Plain language explanation of the risk
-3. Specific risk factors
-4. Severity score (0.0 to 10.0)
+            # Warm the RAG index once before clauses fan out across worker threads
+            if self.llm_enabled:
+                self.rag_retriever.load_dataset()
+            outcomes = AsyncEventLoopThread.instance().run_coroutine(
+                self._assess_clauses(clauses, model, default_model_name, self._new_rag_cache())
+            )
 
-Return ONLY a valid JSON object:
-{{
-  "risk_level": "HIGH",
-  "risk_description": "This clause presents significant liability exposure because...",
-  "risk_factors": ["Factor 1", "Factor 2"],
-  "severity_score": 7.5
-}}
-"""
-                    
-                        try:
-                            response = generate_with_retry(model, prompt)
-                            response_text = response.text.strip()
-                            json_text = re.sub(r'^```json\s*', '', response_text)
-                            json_text = re.sub(r'\s*```$', '', json_text)
-                            risk_data = json.loads(json_text)
-                        except (json.JSONDecodeError, ValueError):
-                            logger.warning("Invalid JSON from risk model; using heuristic fallback")
-                            risk_data = self._fallback_risk_assessment(clause.type)
-                        except Exception as llm_err:
-                            logger.warning("Risk LLM call failed (%s); using heuristic fallback", llm_err)
-                            risk_data = self._fallback_risk_assessment(clause.type)
-                        else:
-                            model_used = default_model_name
-                    else:
-                        risk_data = self._fallback_risk_assessment(clause.type)
+            for clause, outcome in zip(clauses, outcomes):
+                try:
+                    if isinstance(outcome, BaseException):
+                        raise outcome
+                    risk_data, model_used = outcome
                     
                     # Create RiskAssessment object
                     risk = RiskAssessment(
@@ -140,17 +121,6 @@ Return ONLY a valid JSON object:
                 state.get('cost_budget', 0),
                 state.get('cost_spent', 0) + (0.35 if 'pro' in default_model_name else 0.1)
             )
-            state['context_bundle'] = {
-                'document_id': state['document_id'],
-                'metadata_summary': state.get('metadata_summary', {}),
-                'key_entities': state.get('key_entities', []),
-                'document_outline': state.get('document_outline', []),
-                'extracted_clauses': [clause.dict() for clause in state.get('extracted_clauses', [])],
-                'risk_assessments': [assessment.dict() for assessment in risk_assessments],
-                'recommendation_trace': recommendation_trace,
-                'planning_notes': state.get('planning_notes', []),
-                'audit_log': [entry.dict() for entry in state.get('audit_log', [])]
-            }
             
             logger.info(
                 f"Risk assessment complete: {high_risk_count} high-risk clauses, "
@@ -159,6 +129,11 @@ Return ONLY a valid JSON object:
             
             # Ready to send to ADK-B when there are actionable items
             state['ready_for_suggestions'] = high_risk_count > 0
+            # Only the dispatch agent consumes the bundle, so skip serializing it otherwise
+            state['context_bundle'] = (
+                self._build_context_bundle(state, risk_assessments, recommendation_trace)
+                if state['ready_for_suggestions'] else {}
+            )
             
             # Create audit entry
             audit_entry = AuditEntry(
@@ -172,7 +147,7 @@ Return ONLY a valid JSON object:
                     'overall_risk_score': state['overall_risk_score']
                 },
                 model_used=default_model_name,
-                execution_time_ms=(datetime.now() - context['timestamp']).total_seconds() * 1000
+                execution_time_ms=(time.perf_counter_ns() - context['perf_start']) / 1e6
             )
             
             state['audit_log'].append(audit_entry)
@@ -192,6 +167,164 @@ Return ONLY a valid JSON object:
         
         return state
     
+    async def _assess_clauses(self, clauses: List[Clause], model: Any, model_name: str, rag_cache: Dict[str, dict]) -> List[Any]:
+        """Assess clauses in batches of RISK_BATCH_SIZE, keeping at most LLM_CONCURRENCY calls in flight"""
+        sem = asyncio.Semaphore(LLM_CONCURRENCY)
+        batches = [clauses[i:i + RISK_BATCH_SIZE] for i in range(0, len(clauses), RISK_BATCH_SIZE)]
+        gathered = await asyncio.gather(
+            *(self._assess_batch(batch, sem, model, model_name, rag_cache) for batch in batches),
+            return_exceptions=True
+        )
+
+        # Flatten back to one outcome per clause, in clause order
+        outcomes: List[Any] = []
+        for batch, result in zip(batches, gathered):
+            if isinstance(result, BaseException):
+                outcomes.extend([result] * len(batch))
+            else:
+                outcomes.extend(result)
+        return outcomes
+
+    async def _assess_batch(self, batch: List[Clause], sem: asyncio.Semaphore, model: Any, model_name: str, rag_cache: Dict[str, dict]) -> List[Tuple[dict, str]]:
+        loop = asyncio.get_running_loop()
+        async with sem:
+            # RAG lookup and the Gemini call are blocking; generate_with_retry applies the RPM limits
+            return await loop.run_in_executor(self._batch_executor, self._assess_batch_blocking, batch, model, model_name, rag_cache)
+
+    def _assess_batch_blocking(self, batch: List[Clause], model: Any, model_name: str, rag_cache: Dict[str, dict]) -> List[Tuple[dict, str]]:
+        """Return (risk_data, model_used) for each clause in the batch, in order"""
+        # Precedents only feed the prompt, so heuristic-only clauses skip retrieval
+        llm_clauses = [clause for clause in batch if self.llm_enabled and clause.text.strip()]
+        rag_map: Dict[str, Tuple[List[dict], dict]] = {}
+        for clause in llm_clauses:
+            similar_clauses, risk_context = self._lookup_rag_context(clause, rag_cache)
+            rag_map[clause.id] = (similar_clauses, risk_context)
+
+            monitor.log_intermediate_output(
+                self.name,
+                f"rag_retrieval_{clause.id}",
+                f"Found {len(similar_clauses)} similar clauses"
+            )
+
+        assessed: Dict[str, dict] = {}
+        if llm_clauses:
+            prompt = self._build_batch_prompt(llm_clauses, rag_map)
+            try:
+                response = generate_with_retry(model, prompt)
+                response_text = response.text.strip()
+                json_text = self._strip_json_fence(response_text)
+                parsed = json.loads(json_text)
+                if isinstance(parsed, dict):
+                    parsed = [parsed]
+                for item in parsed:
+                    if isinstance(item, dict) and item.get('clause_id') is not None:
+                        assessed[str(item['clause_id'])] = item
+            except (json.JSONDecodeError, ValueError, TypeError):
+                logger.warning("Invalid JSON from risk model; using heuristic fallback")
+            except Exception as llm_err:
+                logger.warning("Risk LLM call failed (%s); using heuristic fallback", llm_err)
+
+        # Clauses the model skipped (or that never reached it) fall back to heuristics
+        results: List[Tuple[dict, str]] = []
+        for clause in batch:
+            risk_data = assessed.get(clause.id)
+            if risk_data is None:
+                results.append((self._fallback_risk_assessment(clause.type), 'heuristic_risk'))
+            else:
+                results.append((risk_data, model_name))
+        return results
+
+    @staticmethod
+    def _strip_json_fence(response_text: str) -> str:
+        """Remove a ```json ... ``` wrapper from a model reply"""
+        if not response_text.startswith('```'):
+            # Unfenced replies are already stripped, so there is nothing to remove
+            return response_text
+        json_text = _JSON_FENCE_HEAD.sub('', response_text)
+        return _JSON_FENCE_TAIL.sub('', json_text)
+
+    @staticmethod
+    def _new_rag_cache() -> Dict[str, dict]:
+        """Per-document memo of RAG lookups, shared by all batches of one run"""
+        return {'precedents': {}, 'risk_context': {}}
+
+    def _lookup_rag_context(self, clause: Clause, rag_cache: Dict[str, dict]) -> Tuple[List[dict], dict]:
+        """Fetch precedents by clause text and risk context by clause type, once each per document"""
+        # Concurrent batches may both miss and compute the same entry; the results are identical
+        precedents = rag_cache['precedents']
+        similar_clauses = precedents.get(clause.text)
+        if similar_clauses is None:
+            # Get relevant precedents from RAG
+            similar_clauses = self.rag_retriever.retrieve_similar_clauses(
+                clause.text,
+                top_k=2
+            )
+            precedents[clause.text] = similar_clauses
+
+        risk_contexts = rag_cache['risk_context']
+        risk_context = risk_contexts.get(clause.type)
+        if risk_context is None:
+            risk_context = self.rag_retriever.get_risk_context(clause.type)
+            risk_contexts[clause.type] = risk_context
+        return similar_clauses, risk_context
+
+    def _build_batch_prompt(self, clauses_slice: List[Clause], rag_map: Dict[str, Tuple[List[dict], dict]]) -> str:
+        """Build one prompt asking for a JSON array of assessments keyed by clause_id"""
+        clause_sections = []
+        known_risks: Dict[str, List[str]] = {}
+        for clause in clauses_slice:
+            similar_clauses, risk_context = rag_map[clause.id]
+            known_risks.setdefault(clause.type, risk_context.get('common_risks', []))
+            clause_sections.append(f"""Clause ID: {clause.id}
+Clause Type: {clause.type}
+Clause Text: {clause.text}
+Similar Precedents:
+{json.dumps([c['text'][:200] for c in similar_clauses], separators=(',', ':'))}""")
+
+        clauses_block = "\n\n---\n\n".join(clause_sections)
+        risks_block = "\n".join(
+            f"{clause_type}: {json.dumps(risks, separators=(',', ':'))}" for clause_type, risks in known_risks.items()
+        )
+
+        return f"""You are a legal risk analyst. Assess the risk of each clause below.
+
+{clauses_block}
+
+Known Risks by Clause Type:
+{risks_block}
+
+For every clause assess:
+1. Risk Level (LOW, MEDIUM, HIGH, or CRITICAL)
+2. Plain language explanation of the risk
+3. Specific risk factors
+4. Severity score (0.0 to 10.0)
+
+Return ONLY a valid JSON array with one object per clause:
+[
+  {{
+    "clause_id": "clause_1",
+    "risk_level": "HIGH",
+    "risk_description": "This clause presents significant liability exposure because...",
+    "risk_factors": ["Factor 1", "Factor 2"],
+    "severity_score": 7.5
+  }}
+]
+"""
+    
+    def _build_context_bundle(self, state: LegalDocumentState, risk_assessments: List[RiskAssessment], recommendation_trace: List[dict]) -> dict:
+        """Serialize the state ADK-B needs to produce suggestions"""
+        return {
+            'document_id': state['document_id'],
+            'metadata_summary': state.get('metadata_summary', {}),
+            'key_entities': state.get('key_entities', []),
+            'document_outline': state.get('document_outline', []),
+            'extracted_clauses': _CLAUSES_ADAPTER.dump_python(state.get('extracted_clauses', [])),
+            'risk_assessments': _RISK_ADAPTER.dump_python(risk_assessments),
+            'recommendation_trace': recommendation_trace,
+            'planning_notes': state.get('planning_notes', []),
+            'audit_log': _AUDIT_ADAPTER.dump_python(state.get('audit_log', []))
+        }
+
     def _fallback_risk_assessment(self, clause_type: str) -> dict:
         """Fallback risk assessment based on clause type"""
         risk_defaults = {
@@ -1,5 +1,7 @@
 import os
+import sys
 import logging
+from dataclasses import dataclass
 from dotenv import load_dotenv
 import google.generativeai as genai
 
@@ -43,7 +45,44 @@ LLM_MIN_CALL_INTERVAL = float(
 LLM_MAX_RETRY_ATTEMPTS = int(os.getenv("LLM_MAX_RETRY_ATTEMPTS", "5"))
 LLM_TPM_LIMIT = int(os.getenv("LLM_TPM_LIMIT", "1000000"))
 LLM_RPD_LIMIT = int(os.getenv("LLM_RPD_LIMIT", "200"))
-FORCE_SEQUENTIAL_EXECUTION = os.getenv("FORCE_SEQUENTIAL_EXECUTION", "true").lower() == "true"# RAG Configuration
+FORCE_SEQUENTIAL_EXECUTION = os.getenv("FORCE_SEQUENTIAL_EXECUTION", "true").lower() == "true"
+# Max in-flight LLM calls per agent; sequential mode defaults to one at a time
+LLM_CONCURRENCY = max(
+    int(os.getenv("LLM_CONCURRENCY", "1" if FORCE_SEQUENTIAL_EXECUTION else "4")), 1
+)
+# Clauses assessed per risk-detection prompt
+RISK_BATCH_SIZE = max(int(os.getenv("RISK_BATCH_SIZE", "8")), 1)
+
+# slots= is only accepted by dataclass on Python 3.10+
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(frozen=True, **_DATACLASS_SLOTS)
+class Config:
+    """Immutable snapshot of the runtime settings read from the environment at import"""
+    force_sequential: bool
+    llm_rpm_limit: int
+    llm_min_interval: float
+    llm_max_retry_attempts: int
+    llm_tpm_limit: int
+    llm_rpd_limit: int
+    llm_concurrency: int
+    risk_batch_size: int
+
+
+# The module-level names above stay as aliases for existing imports
+CONFIG = Config(
+    force_sequential=FORCE_SEQUENTIAL_EXECUTION,
+    llm_rpm_limit=LLM_RPM_LIMIT,
+    llm_min_interval=LLM_MIN_CALL_INTERVAL,
+    llm_max_retry_attempts=LLM_MAX_RETRY_ATTEMPTS,
+    llm_tpm_limit=LLM_TPM_LIMIT,
+    llm_rpd_limit=LLM_RPD_LIMIT,
+    llm_concurrency=LLM_CONCURRENCY,
+    risk_batch_size=RISK_BATCH_SIZE,
+)
+
+# RAG Configuration
 DATASET_NAME = "d0r1h/ILC"
 CHUNK_SIZE = 1000
 CHUNK_OVERLAP = 200
\ No newline at end of file
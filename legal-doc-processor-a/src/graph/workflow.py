@@ -3,26 +3,33 @@ from src.state.shared_state import LegalDocumentState
 from src.agents.document_ingestion_agent import DocumentIngestionAgent
 from src.agents.planning_agent import PlanningAgent
 from src.agents.parallel_insights_agent import ParallelInsightsAgent
-from typing import Optional
+from src.utils.event_loop import AsyncEventLoopThread
+from functools import lru_cache
+from typing import Any, Optional, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
 
 def create_adk_a_workflow():
     """Create LangGraph workflow for ADK-A"""
+    return _build_adk_a_workflow()[0]
+
+def _build_adk_a_workflow() -> Tuple[Any, ParallelInsightsAgent]:
+    """Compile the workflow and return it with the agent that owns its thread pools"""
     
     # Initialize agents
     ingestion_agent = DocumentIngestionAgent()
-    planning_agent = PlanningAgent()
     parallel_agent = ParallelInsightsAgent()
+    # Planning hands off to the parallel agent's prefetch so its prework overlaps planning
+    planning_agent = PlanningAgent(prefetch=parallel_agent.prefetch)
     
     # Create workflow graph
     workflow = StateGraph(LegalDocumentState)
     
-    # Add nodes
-    workflow.add_node("ingest_document", ingestion_agent.process)
-    workflow.add_node("plan_pipeline", planning_agent.process)
-    workflow.add_node("parallel_insights", parallel_agent.process)
+    # Add nodes; async entry points let the graph run on one event loop
+    workflow.add_node("ingest_document", ingestion_agent.aprocess)
+    workflow.add_node("plan_pipeline", planning_agent.aprocess)
+    workflow.add_node("parallel_insights", parallel_agent.aprocess)
     
     # Define edges (sequential flow)
     workflow.set_entry_point("ingest_document")
@@ -34,54 +41,78 @@ def create_adk_a_workflow():
     app = workflow.compile()
     
     logger.info("ADK-A workflow compiled successfully")
-    return app
+    return app, parallel_agent
+
+@lru_cache(maxsize=1)
+def _get_compiled_workflow() -> Tuple[Any, ParallelInsightsAgent]:
+    """Compile the workflow once; agents keep no per-document state between runs"""
+    return _build_adk_a_workflow()
+
+def _get_compiled_app():
+    return _get_compiled_workflow()[0]
+
+def reset_workflow_cache():
+    """Drop the cached app so the next run recompiles (e.g. after config changes)"""
+    if not _get_compiled_workflow.cache_info().currsize:
+        return
+    _, parallel_agent = _get_compiled_workflow()
+    _get_compiled_workflow.cache_clear()
+    # The dropped app's thread pools would otherwise idle until interpreter exit
+    parallel_agent.close()
+
+# Per-run defaults; copied per call instead of rebuilding the literal every time
+_INITIAL_STATE_TEMPLATE = {
+    'parsed_text': '',
+    'page_count': 0,
+    'clause_count': 0,
+    'high_risk_count': 0,
+    'overall_risk_score': 0.0,
+    'document_complexity': 0.0,
+    'use_complex_model': False,
+    'processing_strategy': 'standard',
+    'cost_budget': 0.0,
+    'cost_spent': 0.0,
+    'ready_for_suggestions': False,
+    'adk_b_response': None,
+    'status': 'pending'
+}
+# Containers agents append to in place, so every run needs fresh ones
+_INITIAL_STATE_LISTS = (
+    'key_entities', 'document_outline', 'extracted_clauses', 'risk_assessments',
+    'planning_notes', 'parallel_tasks', 'audit_log', 'recommendation_trace', 'errors'
+)
+_INITIAL_STATE_DICTS = ('metadata', 'metadata_summary', 'model_plan', 'context_bundle')
+
+def _new_initial_state(document_id: str, document_path: Optional[str], document_text: Optional[str], document_type: str) -> LegalDocumentState:
+    """Build a fresh initial state from the shared template"""
+    state = dict(_INITIAL_STATE_TEMPLATE)
+    for key in _INITIAL_STATE_LISTS:
+        state[key] = []
+    for key in _INITIAL_STATE_DICTS:
+        state[key] = {}
+    state.update(
+        document_id=document_id,
+        document_path=document_path,
+        document_text=document_text or '',
+        document_type=document_type,
+        document_category=document_type
+    )
+    return state
 
 def run_adk_a(document_id: str, document_path: Optional[str] = None, document_text: Optional[str] = None, document_type: str = "contract"):
     """Run ADK-A workflow"""
     
     # Initialize state
-    initial_state: LegalDocumentState = {
-        'document_id': document_id,
-        'document_path': document_path,
-        'document_text': document_text or '',
-        'document_type': document_type,
-        'parsed_text': '',
-        'metadata': {},
-        'page_count': 0,
-        'document_category': document_type,
-        'metadata_summary': {},
-        'key_entities': [],
-        'document_outline': [],
-        'extracted_clauses': [],
-        'clause_count': 0,
-        'risk_assessments': [],
-        'high_risk_count': 0,
-        'overall_risk_score': 0.0,
-        'document_complexity': 0.0,
-        'use_complex_model': False,
-        'processing_strategy': 'standard',
-        'model_plan': {},
-        'cost_budget': 0.0,
-        'cost_spent': 0.0,
-        'planning_notes': [],
-        'parallel_tasks': [],
-        'ready_for_suggestions': False,
-        'adk_b_response': None,
-        'context_bundle': {},
-        'audit_log': [],
-        'recommendation_trace': [],
-        'errors': [],
-        'status': 'pending'
-    }
+    initial_state = _new_initial_state(document_id, document_path, document_text, document_type)
     
-    # Create and run workflow
-    app = create_adk_a_workflow()
+    # Reuse the compiled workflow across documents
+    app = _get_compiled_app()
     
     logger.info(f"Starting ADK-A workflow for document: {document_id}")
     
     try:
-        # Run the workflow
-        result = app.invoke(initial_state)
+        # Run the workflow on the shared background loop (works even if the caller has a loop)
+        result = AsyncEventLoopThread.instance().run_coroutine(app.ainvoke(initial_state))
         
         logger.info(f"ADK-A workflow completed for document: {document_id}")
         logger.info(f"Status: {result['status']}, Clauses: {result['clause_count']}, High Risk: {result['high_risk_count']}")
@@ -90,6 +121,8 @@ def run_adk_a(document_id: str, document_path: Optional[str] = None, document_te
         
     except Exception as e:
         logger.error(f"Error in ADK-A workflow: {str(e)}")
-        initial_state['status'] = 'error'
-        initial_state['errors'].append(f"Workflow error: {str(e)}")
-        return initial_state
\ No newline at end of file
+        # initial_state may have been handed to partially executed nodes; report on a fresh copy
+        error_state = _new_initial_state(document_id, document_path, document_text, document_type)
+        error_state['status'] = 'error'
+        error_state['errors'].append(f"Workflow error: {str(e)}")
+        return error_state
\ No newline at end of file
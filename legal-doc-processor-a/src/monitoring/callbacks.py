@@ -1,15 +1,16 @@
 import time
+import atexit
 import logging
 import json
 import os
+import queue
+import threading
+from collections import deque
 from pathlib import Path
 from typing import Dict, Any
 from datetime import datetime
-from pymongo import MongoClient
-from pymongo.errors import PyMongoError
 from src.config import MONGODB_URI, DATABASE_NAME
-from src.utils.persistence import serialize_payload
-import certifi
+from src.utils.persistence import json_default
 
 # Setup logging
 logging.basicConfig(
@@ -18,6 +19,12 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Buffered Mongo events are flushed in one insert_many once either limit is hit
+FLUSH_THRESHOLD = 50
+FLUSH_INTERVAL_SECONDS = 2.0
+# Local audit events waiting for the writer thread; new events are dropped when full
+AUDIT_QUEUE_MAXSIZE = 10000
+
 class MonitoringCallback:
     """Callback handler for tracking agent execution"""
     
@@ -29,9 +36,24 @@ class MonitoringCallback:
         self.metrics_collection = None
         self.audit_dir = Path(os.getenv("ADK_AUDIT_LOG_DIR", "audits"))
         self.audit_dir.mkdir(parents=True, exist_ok=True)
+        self._audit_queue = queue.Queue(maxsize=AUDIT_QUEUE_MAXSIZE)
+        self._audit_writer = threading.Thread(
+            target=self._audit_writer_loop, name="monitor-audit-writer", daemon=True
+        )
+        self._audit_writer.start()
+        atexit.register(self._stop_audit_writer)
+        self._log_buffer = deque()
+        self._metric_buffer = deque()
+        self._buffer_lock = threading.Lock()
+        # Set when a buffer reaches FLUSH_THRESHOLD so the flusher drains it off the caller's thread
+        self._flush_requested = threading.Event()
+
+        # Imported here so merely importing this module stays cheap
+        import certifi
 
         ca_file = certifi.where()
         if self._initialize_client(ca_file, allow_insecure=False):
+            self._start_flusher()
             return
 
         logger.warning(
@@ -43,9 +65,38 @@ class MonitoringCallback:
             logger.warning(
                 "MonitoringCallback running in degraded mode (MongoDB unavailable)"
             )
+            return
+        self._start_flusher()
+
+    def _start_flusher(self):
+        """Drain idle buffers periodically and once more at interpreter exit."""
+        flusher = threading.Thread(target=self._flush_loop, name="monitor-flush", daemon=True)
+        flusher.start()
+        atexit.register(self._flush_all)
+
+    def _flush_loop(self):
+        while True:
+            self._flush_requested.wait(FLUSH_INTERVAL_SECONDS)
+            self._flush_requested.clear()
+            self._flush_all()
+
+    @staticmethod
+    def _wire_compressors() -> str:
+        """Prefer zstd, then snappy, falling back to zlib which needs no extra package."""
+        compressors = []
+        for name, module in (("zstd", "zstandard"), ("snappy", "snappy")):
+            try:
+                __import__(module)
+            except ImportError:
+                continue
+            compressors.append(name)
+        compressors.append("zlib")
+        return ",".join(compressors)
 
     def _initialize_client(self, ca_file: str, allow_insecure: bool) -> bool:
         """Try to connect to MongoDB with optional relaxed TLS requirements."""
+        from pymongo import MongoClient, WriteConcern
+
         for attempt in range(3):
             try:
                 # Atlas clusters can take a couple of seconds to finish TLS handshakes,
@@ -56,13 +107,17 @@ class MonitoringCallback:
                     connectTimeoutMS=10000,
                     tls=True,
                     tlsCAFile=ca_file,
-                    tlsAllowInvalidCertificates=allow_insecure
+                    tlsAllowInvalidCertificates=allow_insecure,
+                    compressors=self._wire_compressors()
                 )
                 # Force a lightweight connection check
                 self.client.admin.command('ping')
                 self.db = self.client[DATABASE_NAME]
-                self.logs_collection = self.db['execution_logs']
-                self.metrics_collection = self.db['performance_metrics']
+                # Telemetry is advisory: unacknowledged writes skip the ack round-trip.
+                # Anything holding business data should keep the default write concern.
+                telemetry_concern = WriteConcern(w=0)
+                self.logs_collection = self.db['execution_logs'].with_options(write_concern=telemetry_concern)
+                self.metrics_collection = self.db['performance_metrics'].with_options(write_concern=telemetry_concern)
                 logger.info(
                     "MonitoringCallback connected to MongoDB%s",
                     " (TLS validation relaxed)" if allow_insecure else ""
@@ -80,12 +135,14 @@ class MonitoringCallback:
         
     def on_agent_start(self, agent_name: str, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """Called when an agent starts execution"""
+        start_time = time.time()
         context = {
             'agent_name': agent_name,
-            'start_time': time.time(),
+            'start_time': start_time,
+            'perf_start': time.perf_counter_ns(),
             'timestamp': datetime.now(),
             'input_data': input_data,
-            'execution_id': f"{agent_name}_{int(time.time() * 1000)}"
+            'execution_id': f"{agent_name}_{int(start_time * 1000)}"
         }
         
         logger.info(f"[START] Agent: {agent_name} | Input keys: {list(input_data.keys())}")
@@ -107,6 +164,8 @@ class MonitoringCallback:
         """Called when an agent completes execution"""
         end_time = time.time()
         execution_time_ms = (end_time - context['start_time']) * 1000
+        # One wall-clock read shared by the log and metric events
+        timestamp = datetime.now()
         
         logger.info(
             f"[END] Agent: {context['agent_name']} | "
@@ -121,7 +180,7 @@ class MonitoringCallback:
                 'execution_id': context['execution_id'],
                 'agent_name': context['agent_name'],
                 'event': 'end',
-                'timestamp': datetime.now(),
+                'timestamp': timestamp,
                 'execution_time_ms': execution_time_ms,
                 'model_used': model_used,
                 'output_summary': {k: str(v)[:100] for k, v in output_data.items()}
@@ -134,7 +193,7 @@ class MonitoringCallback:
                 'agent_name': context['agent_name'],
                 'execution_time_ms': execution_time_ms,
                 'model_used': model_used,
-                'timestamp': datetime.now(),
+                'timestamp': timestamp,
                 'success': True
             }
         )
@@ -143,6 +202,8 @@ class MonitoringCallback:
         """Called when an agent encounters an error"""
         end_time = time.time()
         execution_time_ms = (end_time - context['start_time']) * 1000
+        # One wall-clock read shared by the log and metric events
+        timestamp = datetime.now()
         
         logger.error(
             f"[ERROR] Agent: {context['agent_name']} | "
@@ -156,7 +217,7 @@ class MonitoringCallback:
                 'execution_id': context['execution_id'],
                 'agent_name': context['agent_name'],
                 'event': 'error',
-                'timestamp': datetime.now(),
+                'timestamp': timestamp,
                 'execution_time_ms': execution_time_ms,
                 'error_message': str(error),
                 'error_type': type(error).__name__
@@ -168,7 +229,7 @@ class MonitoringCallback:
             {
                 'agent_name': context['agent_name'],
                 'execution_time_ms': execution_time_ms,
-                'timestamp': datetime.now(),
+                'timestamp': timestamp,
                 'success': False,
                 'error': str(error)
             }
@@ -190,33 +251,117 @@ class MonitoringCallback:
         )
 
     def _safe_insert(self, collection, payload):
-        """Insert into MongoDB if available, otherwise no-op."""
+        """Queue the payload for a batched MongoDB insert if available, otherwise no-op."""
+        self._write_local_log(payload)
         if not self.enabled or collection is None:
-            self._write_local_log(payload)
             return
-        try:
-            collection.insert_one(payload)
-            self._write_local_log(payload)
-        except PyMongoError as exc:
-            logger.warning("MongoDB insert skipped due to error: %s", exc)
-            self.enabled = False
-            self._write_local_log(payload)
+        buffer = self._log_buffer if collection is self.logs_collection else self._metric_buffer
+        with self._buffer_lock:
+            buffer.append(payload)
+            should_flush = len(buffer) >= FLUSH_THRESHOLD
+        if should_flush:
+            self._flush_requested.set()
+
+    def _flush_all(self):
+        """Write every buffered payload with one unordered insert_many per collection."""
+        if not self.enabled:
+            return
+        with self._buffer_lock:
+            pending = []
+            for collection, buffer in (
+                (self.logs_collection, self._log_buffer),
+                (self.metrics_collection, self._metric_buffer)
+            ):
+                if buffer:
+                    pending.append((collection, list(buffer)))
+                    buffer.clear()
+        if not pending:
+            return
+        from pymongo.errors import PyMongoError
+
+        for collection, batch in pending:
+            if collection is None:
+                continue
+            try:
+                # Unordered so one bad document does not abort the rest of the batch.
+                # Copies are inserted because insert_many adds '_id' to each document and
+                # the audit writer thread may still be serializing the originals.
+                collection.insert_many([dict(doc) for doc in batch], ordered=False)
+            except PyMongoError as exc:
+                logger.warning("MongoDB insert skipped due to error: %s", exc)
+                self.enabled = False
 
     def _write_local_log(self, payload: Dict[str, Any]):
-        """Persist event payloads to per-event JSON files for offline auditing."""
+        """Queue an event payload for the background audit writer."""
+        # Reuse the event's own timestamp and tag the payload in place (no dict copy)
+        timestamp = payload.get('timestamp') or datetime.now()
+        payload['logged_at'] = timestamp.isoformat()
         try:
-            timestamp = datetime.now()
-            sanitized_agent = str(payload.get('agent_name', 'agent')).replace(' ', '_').lower()
-            filename = f"{timestamp.strftime('%Y%m%dT%H%M%S_%f')}_{sanitized_agent}.json"
-            path = self.audit_dir / filename
-            log_entry = serialize_payload({
-                **payload,
-                'logged_at': timestamp.isoformat()
-            })
-            with path.open('w', encoding='utf-8') as log_file:
-                json.dump(log_entry, log_file, indent=2)
-        except Exception as exc:
-            logger.debug("Local audit log write skipped: %s", exc)
-
-# Global callback instance
-monitor = MonitoringCallback()
\ No newline at end of file
+            self._audit_queue.put_nowait((timestamp, payload))
+        except queue.Full:
+            logger.debug("Local audit queue full; dropping %s event", payload.get('event'))
+
+    def _audit_writer_loop(self):
+        """Append queued events as NDJSON lines to hourly files under audit_dir."""
+        while True:
+            batch = [self._audit_queue.get()]
+            while True:
+                try:
+                    batch.append(self._audit_queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = False
+            lines_by_file: Dict[str, list] = {}
+            for item in batch:
+                if item is None:
+                    stop = True
+                    continue
+                timestamp, log_entry = item
+                try:
+                    line = json.dumps(log_entry, default=json_default, separators=(',', ':'))
+                except Exception as exc:
+                    logger.debug("Local audit log write skipped: %s", exc)
+                    continue
+                lines_by_file.setdefault(f"{timestamp.strftime('%Y%m%dT%H')}.ndjson", []).append(line)
+
+            for filename, lines in lines_by_file.items():
+                try:
+                    with (self.audit_dir / filename).open('a', encoding='utf-8') as log_file:
+                        log_file.write('\n'.join(lines) + '\n')
+                except Exception as exc:
+                    logger.debug("Local audit log write skipped: %s", exc)
+            if stop:
+                return
+
+    def _stop_audit_writer(self):
+        """Flush queued audit events before the interpreter exits."""
+        try:
+            self._audit_queue.put(None, timeout=1)
+        except queue.Full:
+            return
+        self._audit_writer.join(timeout=5)
+
+_monitor = None
+_monitor_lock = threading.Lock()
+
+
+def get_monitor() -> MonitoringCallback:
+    """Return the process-wide MonitoringCallback, connecting on first use."""
+    global _monitor
+    if _monitor is None:
+        with _monitor_lock:
+            if _monitor is None:
+                _monitor = MonitoringCallback()
+    return _monitor
+
+
+class _LazyMonitor:
+    """Forward attribute access to get_monitor() so importing `monitor` connects nothing."""
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(get_monitor(), name)
+
+
+# Global callback instance (created on first use)
+monitor = _LazyMonitor()
\ No newline at end of file
@@ -0,0 +1,96 @@
+"""Copy-on-write view over a LegalDocumentState for concurrent sub-agents."""
+from collections.abc import MutableMapping
+from typing import Any, Dict, Iterator, Mapping, Set
+
+_MISSING = object()
+# Top-level containers that agents mutate in place (append/extend/setdefault)
+_MUTABLE_TYPES = (list, dict, set)
+
+
+class CopyOnWriteDict(MutableMapping):
+    """Overlay writes on top of a shared base mapping without copying it.
+
+    Reads fall through to the base mapping. Writes and deletes land in a local
+    overlay, so the base state is never modified. Mutable top-level values
+    (lists, dicts, sets) are shallow-copied into the overlay the first time they
+    are read, because agents append to them in place; nested objects such as
+    Clause or AuditEntry models stay shared by reference.
+    """
+
+    __slots__ = ("_base", "_overrides", "_deleted")
+
+    def __init__(self, base: Mapping[str, Any]):
+        self._base = base
+        self._overrides: Dict[str, Any] = {}
+        self._deleted: Set[str] = set()
+
+    def __getitem__(self, key: str) -> Any:
+        value = self._overrides.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        if key in self._deleted:
+            raise KeyError(key)
+        value = self._base[key]
+        if isinstance(value, _MUTABLE_TYPES):
+            value = value.copy()
+            self._overrides[key] = value
+        return value
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self._overrides[key] = value
+        self._deleted.discard(key)
+
+    def __delitem__(self, key: str) -> None:
+        if key not in self:
+            raise KeyError(key)
+        self._overrides.pop(key, None)
+        if key in self._base:
+            self._deleted.add(key)
+
+    def __contains__(self, key: object) -> bool:
+        if key in self._overrides:
+            return True
+        return key not in self._deleted and key in self._base
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self._overrides
+        for key in self._base:
+            if key not in self._overrides and key not in self._deleted:
+                yield key
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in self:
+            return self[key]
+        return default
+
+    def setdefault(self, key: str, default: Any = None) -> Any:
+        if key in self:
+            return self[key]
+        self[key] = default
+        return default
+
+    def pop(self, key: str, default: Any = _MISSING) -> Any:
+        if key in self:
+            value = self[key]
+            del self[key]
+            return value
+        if default is _MISSING:
+            raise KeyError(key)
+        return default
+
+    def update(self, other: Any = (), **kwargs: Any) -> None:
+        items = other.items() if isinstance(other, Mapping) else other
+        for key, value in items:
+            self[key] = value
+        for key, value in kwargs.items():
+            self[key] = value
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Materialize the view as a plain dict."""
+        return {key: self[key] for key in self}
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()!r})"
@@ -32,6 +32,9 @@ class AuditEntry(BaseModel):
     execution_time_ms: float
 
 # LangGraph State
+# Kept as a TypedDict on purpose: LangGraph 0.0.26 builds one channel per key and
+# merges node return values as dict updates, and every agent (plus CopyOnWriteDict)
+# relies on mapping access such as state['x'], .get() and .setdefault().
 class LegalDocumentState(TypedDict):
     # Input
     document_id: str
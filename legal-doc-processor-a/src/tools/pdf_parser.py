@@ -1,16 +1,183 @@
+import atexit
+import hashlib
+import json
+import multiprocessing
+import os
 import re
-from typing import Dict, Any
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Callable, Dict, Any, List, Optional, Tuple
 from pypdf import PdfReader
 from docx import Document
 import logging
+from src.utils.persistence import atomic_open
 
 logger = logging.getLogger(__name__)
 
+# Legal terms indicator used by estimate_complexity
+LEGAL_TERMS = frozenset({
+    'whereas', 'hereinafter', 'notwithstanding', 'indemnify',
+    'liability', 'jurisdiction', 'arbitration', 'covenant',
+    'warranties', 'representations', 'severability', 'governing law'
+})
+_SENTENCE_SPLIT = re.compile(r'[.!?]+')
+
+# Below this many pages, shipping work to other processes costs more than it saves
+_PARALLEL_PAGE_THRESHOLD = 32
+_MAX_PAGE_WORKERS = 8
+# Long-lived page-extraction pool, created on first large PDF. Workers are
+# spawned, not forked: this process runs Flask, Mongo, audit and event-loop
+# threads whose held locks a forked child would inherit. Spawned workers
+# re-import the entry script, so it must keep side effects lazy or under __main__.
+_PAGE_POOL: Optional[ProcessPoolExecutor] = None
+_PAGE_POOL_LOCK = threading.Lock()
+
+# Bump when the parse result layout changes so stale cache entries are ignored
+_PARSE_CACHE_VERSION = 3
+# Off by default: cache entries hold the full document text, outliving uploads that callers delete
+_PARSE_CACHE_ENABLED = os.getenv("ENABLE_PARSE_CACHE", "false").lower() == "true"
+# Package-local and git-ignored, anchored to the file rather than the working directory
+_DEFAULT_PARSE_CACHE_DIR = Path(__file__).resolve().parents[2] / ".parse_cache"
+_PARSE_CACHE_MAX_ENTRIES = max(int(os.getenv("ADK_PARSE_CACHE_MAX_ENTRIES", "256")), 1)
+
+
+def _extract_page_range(job: Tuple[str, int, int]) -> List[str]:
+    """Worker-process helper: open the PDF once and extract a contiguous page range."""
+    file_path, start, stop = job
+    pages = PdfReader(file_path).pages
+    return [pages[index].extract_text() for index in range(start, stop)]
+
+
+def _page_workers() -> int:
+    return min(_MAX_PAGE_WORKERS, os.cpu_count() or 1)
+
+
+def _get_page_pool() -> ProcessPoolExecutor:
+    global _PAGE_POOL
+    with _PAGE_POOL_LOCK:
+        if _PAGE_POOL is None:
+            _PAGE_POOL = ProcessPoolExecutor(
+                max_workers=_page_workers(),
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _PAGE_POOL
+
+
+def _reset_page_pool(pool: ProcessPoolExecutor) -> None:
+    """Tear down a broken pool so the next large PDF gets a fresh one."""
+    global _PAGE_POOL
+    with _PAGE_POOL_LOCK:
+        if _PAGE_POOL is pool:
+            _PAGE_POOL = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+@atexit.register
+def _shutdown_page_pool() -> None:
+    with _PAGE_POOL_LOCK:
+        pool = _PAGE_POOL
+    if pool is not None:
+        pool.shutdown()
+
+class ParsedDoc:
+    """Parsed PDF holding one full_text string plus per-page (start, end) offsets into it.
+
+    Supports the mapping-style access (``result['full_text']``, ``.get``) that
+    callers used with the old result dict; page texts are sliced on demand.
+    """
+
+    __slots__ = ('full_text', 'metadata', 'format', '_page_offsets')
+    _KEYS = frozenset({'full_text', 'metadata', 'format', 'page_texts'})
+
+    def __init__(self, full_text: str, metadata: Dict[str, Any], page_offsets: List[Tuple[int, int]], format: str = 'pdf'):
+        self.full_text = full_text
+        self.metadata = metadata
+        self.format = format
+        self._page_offsets = page_offsets
+
+    def page_text(self, page_num: int) -> str:
+        """Text of a 1-based page number"""
+        start, end = self._page_offsets[page_num - 1]
+        return self.full_text[start:end]
+
+    @property
+    def page_texts(self) -> Dict[str, str]:
+        return {
+            f"page_{page_num}": self.full_text[start:end]
+            for page_num, (start, end) in enumerate(self._page_offsets, start=1)
+        }
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self._KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._KEYS
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self[key] if key in self._KEYS else default
+
+
+def _parse_cache_dir() -> Path:
+    return Path(os.getenv("ADK_PARSE_CACHE_DIR") or _DEFAULT_PARSE_CACHE_DIR)
+
+
+def _encode_parse_result(result: Any) -> Dict[str, Any]:
+    if isinstance(result, ParsedDoc):
+        return {
+            'kind': 'parsed_doc',
+            'full_text': result.full_text,
+            'metadata': result.metadata,
+            'format': result.format,
+            'page_offsets': result._page_offsets,
+        }
+    return {'kind': 'dict', 'value': result}
+
+
+def _decode_parse_result(data: Dict[str, Any]) -> Any:
+    if data['kind'] == 'parsed_doc':
+        return ParsedDoc(
+            data['full_text'],
+            data['metadata'],
+            [tuple(offsets) for offsets in data['page_offsets']],
+            data['format'],
+        )
+    return data['value']
+
+
+def _write_parse_cache(cache_path: Path, result: Any) -> None:
+    """Store a parse result as JSON via atomic_open, then evict old entries."""
+    cache_dir = cache_path.parent
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    # str() covers pypdf metadata objects that are not plain JSON types
+    payload = json.dumps(_encode_parse_result(result), default=str)
+    with atomic_open(cache_path, 'w') as handle:
+        handle.write(payload)
+    _evict_parse_cache(cache_dir)
+
+
+def _evict_parse_cache(cache_dir: Path) -> None:
+    """Keep at most _PARSE_CACHE_MAX_ENTRIES entries, dropping the least recently used."""
+    entries = []
+    for entry in cache_dir.glob('v*_*.json'):
+        try:
+            entries.append((entry.stat().st_mtime, entry))
+        except OSError:
+            continue
+    if len(entries) <= _PARSE_CACHE_MAX_ENTRIES:
+        return
+    entries.sort()
+    for _, entry in entries[:len(entries) - _PARSE_CACHE_MAX_ENTRIES]:
+        entry.unlink(missing_ok=True)
+
 class DocumentParser:
     """MCP Tool 1: Parse various document formats"""
     
     @staticmethod
-    def parse_pdf(file_path: str) -> Dict[str, Any]:
+    def parse_pdf(file_path: str) -> ParsedDoc:
         """Parse PDF document and extract text with metadata"""
         try:
             reader = PdfReader(file_path)
@@ -23,21 +190,22 @@ class DocumentParser:
                 'creation_date': str(reader.metadata.get('/CreationDate', 'Unknown'))
             }
             
-            # Extract text with page information
-            full_text = []
-            page_texts = {}
-            
-            for page_num, page in enumerate(reader.pages, start=1):
-                page_text = page.extract_text()
-                page_texts[f"page_{page_num}"] = page_text
-                full_text.append(f"[Page {page_num}]\n{page_text}\n")
+            # Build one full_text string and remember where each page sits in it,
+            # rather than keeping a second copy of every page in a dict
+            chunks = []
+            page_offsets = []
+            position = 0
+            for page_num, page_text in enumerate(DocumentParser._extract_pages(file_path, reader), start=1):
+                if chunks:
+                    position += 1  # '\n' joiner between chunks
+                header = f"[Page {page_num}]\n"
+                start = position + len(header)
+                page_offsets.append((start, start + len(page_text)))
+                chunk = f"{header}{page_text}\n"
+                chunks.append(chunk)
+                position += len(chunk)
             
-            result = {
-                'full_text': '\n'.join(full_text),
-                'metadata': metadata,
-                'page_texts': page_texts,
-                'format': 'pdf'
-            }
+            result = ParsedDoc('\n'.join(chunks), metadata, page_offsets)
             
             logger.info(f"Successfully parsed PDF: {file_path} ({metadata['page_count']} pages)")
             return result
@@ -46,6 +214,27 @@ class DocumentParser:
             logger.error(f"Error parsing PDF {file_path}: {str(e)}")
             raise
     
+    @staticmethod
+    def _extract_pages(file_path: str, reader: PdfReader) -> List[str]:
+        """Extract page texts in order, splitting large PDFs into one page range per worker."""
+        page_count = len(reader.pages)
+        workers = _page_workers()
+        if page_count >= _PARALLEL_PAGE_THRESHOLD and workers > 1:
+            step = -(-page_count // workers)
+            jobs = [(file_path, start, min(start + step, page_count)) for start in range(0, page_count, step)]
+            pool = _get_page_pool()
+            try:
+                page_texts: List[str] = []
+                for chunk in pool.map(_extract_page_range, jobs):
+                    page_texts.extend(chunk)
+                return page_texts
+            except BrokenProcessPool as e:
+                _reset_page_pool(pool)
+                logger.warning(f"Page extraction pool broke, extracting sequentially: {str(e)}")
+            except Exception as e:
+                logger.warning(f"Parallel page extraction failed, extracting sequentially: {str(e)}")
+        return [page.extract_text() for page in reader.pages]
+    
     @staticmethod
     def parse_docx(file_path: str) -> Dict[str, Any]:
         """Parse DOCX document"""
@@ -82,9 +271,9 @@ class DocumentParser:
     def parse_document(file_path: str) -> Dict[str, Any]:
         """Auto-detect format and parse document"""
         if file_path.lower().endswith('.pdf'):
-            return DocumentParser.parse_pdf(file_path)
+            return DocumentParser._parse_cached(file_path, DocumentParser.parse_pdf)
         elif file_path.lower().endswith('.docx'):
-            return DocumentParser.parse_docx(file_path)
+            return DocumentParser._parse_cached(file_path, DocumentParser.parse_docx)
         elif file_path.lower().endswith('.txt'):
             with open(file_path, 'r', encoding='utf-8') as f:
                 text = f.read()
@@ -96,26 +285,56 @@ class DocumentParser:
         else:
             raise ValueError(f"Unsupported file format: {file_path}")
     
+    @staticmethod
+    def _parse_cache_path(file_path: str) -> Path:
+        """Cache file for the document's contents, keyed by SHA-256 of its bytes"""
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as handle:
+            for chunk in iter(lambda: handle.read(1 << 20), b''):
+                digest.update(chunk)
+        return _parse_cache_dir() / f"v{_PARSE_CACHE_VERSION}_{digest.hexdigest()}.json"
+
+    @staticmethod
+    def _parse_cached(file_path: str, parse: Callable[[str], Dict[str, Any]]) -> Dict[str, Any]:
+        """Return a previously parsed result for identical file contents, else parse and store it"""
+        if not _PARSE_CACHE_ENABLED:
+            return parse(file_path)
+        cache_path: Optional[Path] = None
+        try:
+            cache_path = DocumentParser._parse_cache_path(file_path)
+            if cache_path.exists():
+                with cache_path.open('r', encoding='utf-8') as handle:
+                    result = _decode_parse_result(json.load(handle))
+                # Refresh mtime so eviction drops the least recently used entries first
+                os.utime(cache_path)
+                logger.info(f"Loaded cached parse for {file_path}")
+                return result
+        except Exception as e:
+            logger.debug(f"Parse cache read skipped for {file_path}: {str(e)}")
+
+        result = parse(file_path)
+
+        if cache_path is not None:
+            try:
+                _write_parse_cache(cache_path, result)
+            except Exception as e:
+                logger.debug(f"Parse cache write skipped for {file_path}: {str(e)}")
+        return result
+    
     @staticmethod
     def estimate_complexity(text: str) -> float:
         """Estimate document complexity for model routing"""
         # Factors: length, legal jargon density, sentence complexity
         
-        words = text.split()
+        # Lowercase once up front instead of once per word
+        words = text.lower().split()
         word_count = len(words)
         
-        # Legal terms indicator
-        legal_terms = [
-            'whereas', 'hereinafter', 'notwithstanding', 'indemnify',
-            'liability', 'jurisdiction', 'arbitration', 'covenant',
-            'warranties', 'representations', 'severability', 'governing law'
-        ]
-        
-        legal_term_count = sum(1 for word in words if word.lower() in legal_terms)
+        legal_term_count = sum(1 for word in words if word in LEGAL_TERMS)
         legal_density = legal_term_count / max(word_count, 1)
         
         # Sentence complexity (average sentence length)
-        sentences = re.split(r'[.!?]+', text)
+        sentences = _SENTENCE_SPLIT.split(text)
         avg_sentence_length = word_count / max(len(sentences), 1)
         
         # Calculate complexity score (0-1)
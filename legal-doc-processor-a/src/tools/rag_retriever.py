@@ -1,37 +1,126 @@
-try:
-    from datasets import load_dataset
-except ImportError:  # pragma: no cover - optional dependency
-    load_dataset = None
-from typing import List, Dict
+from typing import Any, List, Dict, Optional, Tuple
+from functools import lru_cache
 import hashlib
-import google.generativeai as genai
+import threading
 from src.config import DATASET_NAME, CHUNK_SIZE, GEMINI_MODEL_STANDARD
+from src.utils.llm import get_model
 import logging
 import numpy as np
 
 logger = logging.getLogger(__name__)
 
+# Static risk knowledge per clause type; shared, so callers must treat it as read-only
+_RISK_KNOWLEDGE: Dict[str, Dict[str, List[str]]] = {
+    'indemnification': {
+        'common_risks': ['Unlimited liability', 'Broad scope', 'No cap on damages'],
+        'best_practices': ['Include liability caps', 'Define scope clearly', 'Mutual indemnification']
+    },
+    'liability': {
+        'common_risks': ['No limitation', 'Excludes consequential damages unfairly', 'Asymmetric terms'],
+        'best_practices': ['Cap at contract value', 'Allow for gross negligence exceptions', 'Balanced allocation']
+    },
+    'termination': {
+        'common_risks': ['Short notice period', 'No cure period', 'Harsh post-termination obligations'],
+        'best_practices': ['30-60 day notice', 'Allow cure period', 'Clear transition terms']
+    },
+    'confidentiality': {
+        'common_risks': ['Overly broad definition', 'No exclusions', 'Unlimited duration'],
+        'best_practices': ['Define confidential info clearly', 'Standard exclusions', '3-5 year duration']
+    }
+}
+_DEFAULT_RISK_CONTEXT: Dict[str, List[str]] = {
+    'common_risks': ['Non-standard terms', 'Unclear obligations'],
+    'best_practices': ['Follow industry standards', 'Seek legal review']
+}
+
+
+@lru_cache(maxsize=32)
+def _risk_context_for(clause_type: str) -> Dict[str, List[str]]:
+    return _RISK_KNOWLEDGE.get(clause_type.lower(), _DEFAULT_RISK_CONTEXT)
+
+
+@lru_cache(maxsize=1)
+def _get_hasher() -> Optional[Any]:
+    """Stateless, fixed-width hashed embeddings (no fitting required); None without scikit-learn"""
+    try:
+        from sklearn.feature_extraction.text import HashingVectorizer
+    except ImportError:  # pragma: no cover - optional dependency
+        return None
+    return HashingVectorizer(n_features=1024, alternate_sign=False, norm='l2', dtype=np.float32)
+
+
+@lru_cache(maxsize=4096)
+def _get_embedding_cached(text: str) -> Any:
+    """Memoized embedding per text; the same clause text recurs across comparisons in a run"""
+    hasher = _get_hasher()
+    if hasher is not None:
+        return hasher.transform([text])
+    embed: List[float] = []
+    for token in text.lower().split()[:50]:
+        digest = hashlib.sha256(token.encode("utf-8")).digest()
+        # Use first 4 bytes for a stable integer, then normalize to [0, 1)
+        int_val = int.from_bytes(digest[:4], byteorder="big", signed=False)
+        embed.append((int_val % 1000) / 1000.0)
+    return tuple(embed)
+
 class RAGRetriever:
     """MCP Tool 2: Retrieve relevant legal precedents from ILC dataset"""
     
     def __init__(self):
         self.dataset = None
         self.embeddings_cache = {}
-        self.model = genai.GenerativeModel(GEMINI_MODEL_STANDARD)
+        self.model = get_model(GEMINI_MODEL_STANDARD)
+        # TF-IDF index over the dataset; stays None when scikit-learn is unavailable
+        self._vectorizer = None
+        self._doc_matrix = None
+        self._load_lock = threading.Lock()
+        # Per-document term sets for the keyword-overlap fallback, built once at load
+        self._doc_terms: Tuple[frozenset, ...] = ()
         
     def load_dataset(self):
         """Load the ILC legal dataset"""
-        if self.dataset is None:
+        if self.dataset is not None:
+            return
+        # Prefetch and risk batches may call this concurrently; load and index only once
+        with self._load_lock:
+            if self.dataset is not None:
+                return
             try:
-                if load_dataset is None:
+                # Deferred: the datasets package is slow to import and only needed here
+                try:
+                    from datasets import load_dataset as hf_load_dataset
+                except ImportError:  # pragma: no cover - optional dependency
                     raise ImportError("datasets package not installed")
                 logger.info(f"Loading dataset: {DATASET_NAME}")
-                self.dataset = load_dataset(DATASET_NAME, split='train')
-                logger.info(f"Dataset loaded: {len(self.dataset)} documents")
+                dataset = hf_load_dataset(DATASET_NAME, split='train')
+                logger.info(f"Dataset loaded: {len(dataset)} documents")
             except Exception as e:
                 logger.error(f"Error loading dataset: {str(e)}")
                 # Fallback to mock data for demonstration
-                self.dataset = self._create_mock_dataset()
+                dataset = self._create_mock_dataset()
+            self._build_index(dataset)
+            if self._vectorizer is None:
+                self._doc_terms = tuple(frozenset(doc.get('text', '').lower().split()) for doc in dataset)
+            self.dataset = dataset
+
+    def _build_index(self, dataset):
+        """Precompute a sparse TF-IDF matrix so each query is one matrix-vector product.
+
+        Weights are stored as float32: half the bytes of the float64 default, and
+        ranking only needs relative order, not full precision.
+        """
+        try:
+            from sklearn.feature_extraction.text import TfidfVectorizer
+        except ImportError:  # pragma: no cover - optional dependency
+            return
+        try:
+            vectorizer = TfidfVectorizer(lowercase=True, stop_words='english', dtype=np.float32)
+            self._doc_matrix = vectorizer.fit_transform([doc.get('text', '') for doc in dataset])
+            self._vectorizer = vectorizer
+        except Exception as e:
+            logger.warning(f"TF-IDF index unavailable, using keyword overlap: {str(e)}")
+            self._vectorizer = None
+            self._doc_matrix = None
     
     def _create_mock_dataset(self):
         """Create mock legal data if dataset unavailable"""
@@ -64,30 +153,32 @@ class RAGRetriever:
         ]
         return mock_data
     
-    def get_embedding(self, text: str) -> List[float]:
-        """Get deterministic pseudo-embeddings for lightweight similarity scoring."""
-        tokens = text.lower().split()
-        embed: List[float] = []
-        for token in tokens[:50]:
-            digest = hashlib.sha256(token.encode("utf-8")).digest()
-            # Use first 4 bytes for a stable integer, then normalize to [0, 1)
-            int_val = int.from_bytes(digest[:4], byteorder="big", signed=False)
-            embed.append((int_val % 1000) / 1000.0)
-        return embed
+    def get_embedding(self, text: str) -> Any:
+        """Get deterministic pseudo-embeddings for lightweight similarity scoring.
+
+        With scikit-learn this is a 1x1024 L2-normalised sparse row, so embeddings
+        are directly comparable by dot product; otherwise a tuple of hashed token values.
+        Results are memoized per text and shared, so treat them as read-only.
+        """
+        return _get_embedding_cached(text)
     
     def retrieve_similar_clauses(self, query_text: str, top_k: int = 3) -> List[Dict]:
         """Retrieve similar legal clauses from knowledge base"""
         self.load_dataset()
         
         logger.info(f"Retrieving similar clauses for query: {query_text[:100]}...")
+
+        if self._vectorizer is not None:
+            top_results = self._retrieve_tfidf(query_text, top_k)
+            logger.info(f"Retrieved {len(top_results)} similar clauses")
+            return top_results
         
-        # Simple keyword-based retrieval for demonstration
-        query_terms = set(query_text.lower().split())
+        # Simple keyword-based retrieval when no TF-IDF index is available
+        query_terms = frozenset(query_text.lower().split())
         
         results = []
-        for doc in self.dataset:
+        for doc, doc_terms in zip(self.dataset, self._doc_terms):
             doc_text = doc.get('text', '')
-            doc_terms = set(doc_text.lower().split())
             
             # Calculate similarity (Jaccard similarity)
             intersection = len(query_terms.intersection(doc_terms))
@@ -108,28 +199,27 @@ class RAGRetriever:
         logger.info(f"Retrieved {len(top_results)} similar clauses")
         return top_results
     
+    def _retrieve_tfidf(self, query_text: str, top_k: int) -> List[Dict]:
+        """Rank documents by TF-IDF cosine similarity using a sparse matmul and argpartition"""
+        query_vector = self._vectorizer.transform([query_text])
+        similarities = (self._doc_matrix @ query_vector.T).toarray().ravel()
+        k = min(top_k, similarities.shape[0])
+        if k <= 0:
+            return []
+        top_indices = np.argpartition(-similarities, k - 1)[:k]
+        top_indices = top_indices[np.argsort(-similarities[top_indices])]
+
+        results = []
+        for index in top_indices:
+            doc = self.dataset[int(index)]
+            results.append({
+                'text': doc.get('text', ''),
+                'category': doc.get('category', 'general'),
+                'risk_level': doc.get('risk_level', 'unknown'),
+                'similarity': float(similarities[index])
+            })
+        return results
+    
     def get_risk_context(self, clause_type: str) -> Dict:
         """Get risk assessment context for specific clause types"""
-        risk_knowledge = {
-            'indemnification': {
-                'common_risks': ['Unlimited liability', 'Broad scope', 'No cap on damages'],
-                'best_practices': ['Include liability caps', 'Define scope clearly', 'Mutual indemnification']
-            },
-            'liability': {
-                'common_risks': ['No limitation', 'Excludes consequential damages unfairly', 'Asymmetric terms'],
-                'best_practices': ['Cap at contract value', 'Allow for gross negligence exceptions', 'Balanced allocation']
-            },
-            'termination': {
-                'common_risks': ['Short notice period', 'No cure period', 'Harsh post-termination obligations'],
-                'best_practices': ['30-60 day notice', 'Allow cure period', 'Clear transition terms']
-            },
-            'confidentiality': {
-                'common_risks': ['Overly broad definition', 'No exclusions', 'Unlimited duration'],
-                'best_practices': ['Define confidential info clearly', 'Standard exclusions', '3-5 year duration']
-            }
-        }
-        
-        return risk_knowledge.get(clause_type.lower(), {
-            'common_risks': ['Non-standard terms', 'Unclear obligations'],
-            'best_practices': ['Follow industry standards', 'Seek legal review']
-        })
\ No newline at end of file
+        return _risk_context_for(clause_type)
\ No newline at end of file
@@ -0,0 +1,59 @@
+"""Process-wide background event loop for running coroutines from sync code."""
+from __future__ import annotations
+
+import asyncio
+import atexit
+import concurrent.futures
+import threading
+from typing import Any, Coroutine, Optional
+
+
+class AsyncEventLoopThread:
+    """Own one long-lived event loop on a daemon thread.
+
+    Synchronous callers submit coroutines with ``run_coroutine`` instead of
+    spinning up a fresh thread and event loop per call.
+    """
+
+    _instance: Optional["AsyncEventLoopThread"] = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self) -> None:
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(
+            target=self._run_loop,
+            name="adk-a-event-loop",
+            daemon=True,
+        )
+        self.thread.start()
+
+    @classmethod
+    def instance(cls) -> "AsyncEventLoopThread":
+        """Return the shared loop thread, starting it on first use."""
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+                    atexit.register(cls._instance.close)
+        return cls._instance
+
+    def _run_loop(self) -> None:
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def submit(self, coroutine: Coroutine[Any, Any, Any]) -> "concurrent.futures.Future[Any]":
+        """Schedule a coroutine on the background loop without waiting for it."""
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop)
+
+    def run_coroutine(self, coroutine: Coroutine[Any, Any, Any]) -> Any:
+        """Run a coroutine on the background loop and block until it finishes."""
+        if threading.current_thread() is self.thread:
+            coroutine.close()
+            raise RuntimeError("run_coroutine cannot block the background loop thread itself")
+        return self.submit(coroutine).result()
+
+    def close(self) -> None:
+        if not self.loop.is_running():
+            return
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(timeout=5)
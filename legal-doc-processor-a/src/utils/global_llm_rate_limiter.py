@@ -13,48 +13,41 @@ from collections import deque
 from typing import Deque
 
 _LOCK = threading.Lock()
-_REQUEST_HISTORY: Deque[float] = deque()
 _LAST_REQUEST_TS: float = 0.0
+# All timestamps are time.monotonic() so wall-clock/NTP adjustments cannot skew the window
+# Earliest time the next caller may be admitted; advanced by every reservation
+_NEXT_SLOT: float = 0.0
 _MIN_INTERVAL: float = 1.0
 _RPM_LIMIT: int = 60
+# Reserved slot times of the last _RPM_LIMIT admissions; older ones fall off on append
+_REQUEST_HISTORY: Deque[float] = deque(maxlen=_RPM_LIMIT)
 _PATCH_INSTALLED: bool = False
 
 
-def _compute_wait(now: float) -> float:
-    wait_interval = (_LAST_REQUEST_TS + _MIN_INTERVAL) - now
-
-    window_start = now - 60.0
-    while _REQUEST_HISTORY and _REQUEST_HISTORY[0] < window_start:
-        _REQUEST_HISTORY.popleft()
-
-    wait_window = 0.0
-    if len(_REQUEST_HISTORY) >= _RPM_LIMIT:
-        oldest = _REQUEST_HISTORY[0]
-        wait_window = max(0.0, 60.0 - (now - oldest))
-
-    return max(wait_interval, wait_window, 0.0)
-
-
-def _record_request(ts: float) -> None:
-    global _LAST_REQUEST_TS
-    _LAST_REQUEST_TS = ts
-    _REQUEST_HISTORY.append(ts)
+def _reserve_slot() -> float:
+    """Claim the caller's own monotonic admission time; caller must hold _LOCK."""
+    global _LAST_REQUEST_TS, _NEXT_SLOT
+    slot = max(time.monotonic(), _NEXT_SLOT)
+    if len(_REQUEST_HISTORY) == _REQUEST_HISTORY.maxlen:
+        # The slot _RPM_LIMIT reservations back must be a full minute old
+        slot = max(slot, _REQUEST_HISTORY[0] + 60.0)
+    _NEXT_SLOT = slot + _MIN_INTERVAL
+    _LAST_REQUEST_TS = slot
+    _REQUEST_HISTORY.append(slot)
+    return slot
 
 
 def _block_until_slot_sync() -> None:
-    while True:
-        with _LOCK:
-            now = time.time()
-            wait_for = _compute_wait(now)
-            if wait_for <= 0:
-                _record_request(time.time())
-                return
-        if wait_for > 0:
-            logging.info(
-                "[GlobalLLMRateLimiter] Waiting %.2fs before next LLM call (sync)",
-                wait_for,
-            )
-            time.sleep(wait_for)
+    with _LOCK:
+        slot_time = _reserve_slot()
+    wait_for = slot_time - time.monotonic()
+    # Each caller sleeps exactly until its own slot, so there is no wake-up race
+    if wait_for > 0:
+        logging.info(
+            "[GlobalLLMRateLimiter] Waiting %.2fs before next LLM call (sync)",
+            wait_for,
+        )
+        time.sleep(wait_for)
 
 
 def _sleep_interval(value: float) -> float:
@@ -62,19 +55,15 @@ def _sleep_interval(value: float) -> float:
 
 
 async def _block_until_slot_async() -> None:
-    while True:
-        with _LOCK:
-            now = time.time()
-            wait_for = _compute_wait(now)
-            if wait_for <= 0:
-                _record_request(time.time())
-                return
-        if wait_for > 0:
-            logging.info(
-                "[GlobalLLMRateLimiter] Waiting %.2fs before next LLM call (async)",
-                wait_for,
-            )
-            await asyncio.sleep(_sleep_interval(wait_for))
+    with _LOCK:
+        slot_time = _reserve_slot()
+    wait_for = slot_time - time.monotonic()
+    if wait_for > 0:
+        logging.info(
+            "[GlobalLLMRateLimiter] Waiting %.2fs before next LLM call (async)",
+            wait_for,
+        )
+        await asyncio.sleep(_sleep_interval(wait_for))
 
 
 def _wrap_sync_method(cls, method_name: str) -> None:
@@ -109,7 +98,7 @@ def _wrap_async_method(cls, method_name: str) -> None:
 
 def install_global_llm_rate_limiter(min_interval: float, rpm_limit: int) -> None:
     """Patch google.genai.models.Models/AsyncModels to enforce global limits."""
-    global _MIN_INTERVAL, _RPM_LIMIT, _PATCH_INSTALLED
+    global _MIN_INTERVAL, _RPM_LIMIT, _PATCH_INSTALLED, _REQUEST_HISTORY
 
     if _PATCH_INSTALLED:
         return
@@ -128,6 +117,8 @@ def install_global_llm_rate_limiter(min_interval: float, rpm_limit: int) -> None
 
     _MIN_INTERVAL = max(min_interval, 0.1)
     _RPM_LIMIT = max(int(rpm_limit), 1)
+    with _LOCK:
+        _REQUEST_HISTORY = deque(_REQUEST_HISTORY, maxlen=_RPM_LIMIT)
 
     logging.info(
         "Installing global LLM rate limiter (interval=%.2fs, rpm=%s)",
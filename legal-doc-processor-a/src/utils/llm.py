@@ -1,17 +1,30 @@
 """Utility helpers for resilient Gemini calls."""
 from __future__ import annotations
 
+import hashlib
 import logging
+import random
 import threading
 import time
-from collections import deque
+from collections import OrderedDict
+from concurrent.futures import Future
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
 from typing import Any
 
+import google.generativeai as genai
+
 from src.config import (
     LLM_MAX_RETRY_ATTEMPTS,
     LLM_MIN_CALL_INTERVAL,
     LLM_RPM_LIMIT,
 )
+from src.utils.rate_limiter import TokenBucket
+
+try:  # Optional: xxh3 hashes long prompts several times faster than hashlib
+    import xxhash  # type: ignore
+except ImportError:  # pragma: no cover - optional dependency
+    xxhash = None
 
 try:  # Import may differ across google-genai versions
     from google.genai.errors import ClientError  # type: ignore
@@ -19,11 +32,48 @@ except Exception:  # pragma: no cover - optional dependency variations
     ClientError = Exception  # type: ignore
 
 RETRYABLE_STATUS = {429, 500, 503}
+MAX_BACKOFF = 30.0
 REQUEST_LOCK = threading.Lock()
 LAST_REQUEST_TS = 0.0
-REQUEST_HISTORY = deque(maxlen=max(LLM_RPM_LIMIT, 10))
+# Any 60s window admits at most capacity + rate calls, so one of the LLM_RPM_LIMIT
+# slots goes to the single-call burst and the rest to the refill rate
+RPM_LIMITER = TokenBucket(max(LLM_RPM_LIMIT - 1, 0.5), capacity=1)
 MIN_INTERVAL = LLM_MIN_CALL_INTERVAL
-RESPONSE_CACHE: dict[str, Any] = {}
+# Bounded LRU of responses; the least recently used entry is evicted past CACHE_MAX
+CACHE_MAX = 512
+RESPONSE_CACHE: OrderedDict[Any, Any] = OrderedDict()
+# Distinguishes a miss from a cached falsy response in a single lookup
+_MISS = object()
+# Single-flight: identical prompts already being generated share the leader's result
+IN_FLIGHT: dict[Any, Future] = {}
+# Guards RESPONSE_CACHE and IN_FLIGHT
+CACHE_LOCK = threading.Lock()
+
+
+@lru_cache(maxsize=8)
+def get_model(name: str) -> Any:
+    """Return a process-wide GenerativeModel handle for the given model name."""
+    return genai.GenerativeModel(name)
+
+
+def _model_name(model: Any) -> str:
+    return getattr(model, "model_name", None) or getattr(model, "_model_id", None) or repr(type(model))
+
+
+def _cache_key(model: Any, prompt: str, system: str | None = None) -> Any:
+    """Short in-process key over (model, system instruction, prompt).
+
+    A 128-bit xxh3 int when xxhash is available, else a 16-byte BLAKE2b digest.
+    """
+    if system is None:
+        # GenerativeModel keeps its system_instruction privately; fold it in when set
+        system = str(getattr(model, "_system_instruction", None) or "")
+    key_bytes = b"\x00".join(
+        (_model_name(model).encode("utf-8"), system.encode("utf-8"), prompt.encode("utf-8"))
+    )
+    if xxhash is not None:
+        return xxhash.xxh3_128_intdigest(key_bytes)
+    return hashlib.blake2b(key_bytes, digest_size=16).digest()
 
 
 def _is_retryable(error: Exception) -> bool:
@@ -37,31 +87,38 @@ def _is_retryable(error: Exception) -> bool:
     return False
 
 
+def _parse_retry_after_header(error: Exception) -> float | None:
+    """Return the Retry-After delay in seconds carried by an HTTP error response, if any."""
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    if not headers:
+        return None
+    value = headers.get("Retry-After") or headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:  # HTTP-date form
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
 def _respect_rate_limits() -> None:
     """Block until both per-request and per-minute limits are satisfied."""
     global LAST_REQUEST_TS
-    now = time.time()
-    wait_for_interval = LAST_REQUEST_TS + MIN_INTERVAL - now
-    if wait_for_interval > 0:
-        time.sleep(wait_for_interval)
-        now = time.time()
-
-    # Clean up history older than 60 seconds
-    window_start = now - 60.0
-    while REQUEST_HISTORY and REQUEST_HISTORY[0] < window_start:
-        REQUEST_HISTORY.popleft()
-
-    if len(REQUEST_HISTORY) >= LLM_RPM_LIMIT:
-        wait_for_window = 60.0 - (now - REQUEST_HISTORY[0])
-        if wait_for_window > 0:
-            time.sleep(wait_for_window)
-            now = time.time()
-            window_start = now - 60.0
-            while REQUEST_HISTORY and REQUEST_HISTORY[0] < window_start:
-                REQUEST_HISTORY.popleft()
-
-    LAST_REQUEST_TS = time.time()
-    REQUEST_HISTORY.append(LAST_REQUEST_TS)
+    monotonic = time.monotonic
+    # First call has no previous request to space from (and monotonic() may be
+    # smaller than MIN_INTERVAL shortly after boot)
+    if LAST_REQUEST_TS:
+        wait_for_interval = LAST_REQUEST_TS + MIN_INTERVAL - monotonic()
+        if wait_for_interval > 0:
+            time.sleep(wait_for_interval)
+
+    # Only sleeps once the bucket is drained
+    RPM_LIMITER.wait()
+    LAST_REQUEST_TS = monotonic()
 
 
 def generate_with_retry(
@@ -70,35 +127,75 @@ def generate_with_retry(
     max_attempts: int | None = None,
     base_delay: int = 3,
     enable_cache: bool = True,
+    system: str | None = None,
 ):
-    """Invoke model.generate_content with exponential backoff on retryable failures."""
-    import hashlib
-    
+    """Invoke model.generate_content with jittered backoff on retryable failures.
+
+    With caching enabled, concurrent calls for the same prompt are coalesced
+    into one model call whose result (or error) every caller receives. Cached
+    responses are scoped to the model and its system instruction; pass ``system``
+    to override the one read from the model.
+    """
+    if not enable_cache:
+        return _call_with_retry(model, prompt, max_attempts, base_delay)
+
     # Check cache first
-    if enable_cache:
-        cache_key = hashlib.sha256(prompt.encode()).hexdigest()[:16]
-        if cache_key in RESPONSE_CACHE:
-            logging.info("Cache hit for prompt (key: %s)", cache_key)
-            return RESPONSE_CACHE[cache_key]
-    
+    cache_key = _cache_key(model, prompt, system)
+    with CACHE_LOCK:
+        cached = RESPONSE_CACHE.get(cache_key, _MISS)
+        if cached is not _MISS:
+            logging.info("Cache hit for prompt (key: %r)", cache_key)
+            RESPONSE_CACHE.move_to_end(cache_key)
+            return cached
+        pending = IN_FLIGHT.get(cache_key)
+        leader = pending is None
+        if leader:
+            pending = IN_FLIGHT[cache_key] = Future()
+
+    if not leader:
+        logging.info("Joining in-flight request for prompt (key: %r)", cache_key)
+        return pending.result()
+
+    try:
+        result = _call_with_retry(model, prompt, max_attempts, base_delay)
+    except BaseException as exc:
+        pending.set_exception(exc)
+        raise
+    else:
+        # Cache successful response
+        with CACHE_LOCK:
+            RESPONSE_CACHE[cache_key] = result
+            if len(RESPONSE_CACHE) > CACHE_MAX:
+                RESPONSE_CACHE.popitem(last=False)
+        pending.set_result(result)
+        return result
+    finally:
+        with CACHE_LOCK:
+            IN_FLIGHT.pop(cache_key, None)
+
+
+def _call_with_retry(model: Any, prompt: str, max_attempts: int | None, base_delay: int):
     last_error: Exception | None = None
     attempts = max_attempts or LLM_MAX_RETRY_ATTEMPTS
+    prev_sleep = float(base_delay)
     for attempt in range(1, attempts + 1):
         try:
             with REQUEST_LOCK:
                 _respect_rate_limits()
-            result = model.generate_content(prompt)
-            
-            # Cache successful response
-            if enable_cache:
-                RESPONSE_CACHE[cache_key] = result
-            
-            return result
+            return model.generate_content(prompt)
         except Exception as exc:  # pragma: no cover - network exceptions are runtime only
             last_error = exc
             if attempt >= attempts or not _is_retryable(exc):
                 raise
-            sleep_for = float(base_delay ** attempt)
+            retry_after = getattr(exc, "retry_after", None) or _parse_retry_after_header(exc)
+            if retry_after is not None:
+                # Server-mandated wait plus a little jitter so workers don't wake together
+                sleep_for = float(retry_after)
+                sleep_for += random.uniform(0, 0.5 * sleep_for)
+            else:
+                # Decorrelated jitter keeps concurrent workers from retrying in lockstep
+                sleep_for = min(MAX_BACKOFF, random.uniform(base_delay, prev_sleep * 3))
+                prev_sleep = sleep_for
             logging.warning(
                 "LLM call failed (attempt %s/%s): %s. Retrying in %.1fs",
                 attempt,
@@ -109,4 +206,4 @@ def generate_with_retry(
             time.sleep(sleep_for)
     if last_error:
         raise last_error
-    raise RuntimeError("generate_with_retry failed without executing model call")
+    raise RuntimeError("generate_with_retry failed without executing model call")
\ No newline at end of file
@@ -1,22 +1,49 @@
 import json
 import os
+import uuid
+from contextlib import contextmanager
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict
+from typing import IO, Any, Dict, Iterable, Iterator, Optional
 
 from pydantic import BaseModel
 
+try:  # Optional: Rust-backed encoder, several times faster than stdlib json
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
 PROJECT_ROOT = Path(__file__).resolve().parents[3]
 DEFAULT_OUTPUT_DIR = PROJECT_ROOT / "Output"
 
 
-def _ensure_output_dir() -> Path:
-    output_dir = Path(os.getenv("ADK_OUTPUT_DIR", DEFAULT_OUTPUT_DIR))
+@lru_cache(maxsize=4)
+def _ensure_output_dir_cached(env_value: Optional[str]) -> Path:
+    output_dir = Path(env_value or DEFAULT_OUTPUT_DIR)
     output_dir.mkdir(parents=True, exist_ok=True)
     return output_dir
 
 
-def _json_default(value: Any):
+def _ensure_output_dir() -> Path:
+    # mkdir runs once per distinct ADK_OUTPUT_DIR value rather than on every write;
+    # atomic_open recreates the directory if it is deleted later
+    return _ensure_output_dir_cached(os.getenv("ADK_OUTPUT_DIR"))
+
+
+def _format_timestamp(now: Optional[datetime] = None) -> str:
+    """Format as %Y%m%dT%H%M%S without strftime's per-call format parsing."""
+    now = now or datetime.now()
+    return f"{now.year:04d}{now.month:02d}{now.day:02d}T{now.hour:02d}{now.minute:02d}{now.second:02d}"
+
+
+@contextmanager
+def persist_batch() -> Iterator[str]:
+    """Yield one timestamp to pass to every persist_* call for the same document."""
+    yield _format_timestamp()
+
+
+def json_default(value: Any):
     """Serialize pydantic models, datetimes, and sets for JSON persistence."""
     if isinstance(value, BaseModel):
         return value.model_dump()
@@ -31,31 +58,126 @@ def _json_default(value: Any):
     return str(value)
 
 
-def serialize_payload(payload: Any) -> Any:
-    """Convert nested pydantic models into plain Python structures."""
-    return json.loads(json.dumps(payload, default=_json_default))
+_PLAIN_SCALARS = (str, int, float, bool, type(None))
+
+
+def to_plain(payload: Any) -> Any:
+    """Convert nested pydantic models into JSON-compatible Python structures in one walk.
+
+    Models referenced more than once are dumped once. Call this at the pipeline
+    boundary and hand the result to both reporting and persistence.
+    """
+    return _to_plain(payload, {})
+
 
+def _to_plain(payload: Any, memo: Dict[int, Any]) -> Any:
+    if isinstance(payload, _PLAIN_SCALARS):
+        return payload
+    if isinstance(payload, dict):
+        return {
+            key if isinstance(key, str) else str(key): _to_plain(value, memo)
+            for key, value in payload.items()
+        }
+    if isinstance(payload, (list, tuple)):
+        return [_to_plain(item, memo) for item in payload]
+    if isinstance(payload, BaseModel):
+        # The payload tree keeps every model alive during the walk, so ids are stable
+        dumped = memo.get(id(payload))
+        if dumped is None:
+            dumped = memo[id(payload)] = payload.model_dump(mode="json")
+        return dumped
+    converted = json_default(payload)
+    # str() fallback and isoformat() results are already plain
+    return converted if isinstance(converted, str) else _to_plain(converted, memo)
 
-def persist_json_output(prefix: str, document_id: str, payload: Dict[str, Any]) -> Path:
+
+@contextmanager
+def atomic_open(path: Path, mode: str) -> Iterator[IO[Any]]:
+    """Write to a unique temp sibling, fsync, then os.replace it over path so readers never see a partial file."""
+    tmp_path = path.parent / f".{path.name}.{uuid.uuid4().hex}.tmp"
+    # O_EXCL makes the name ours alone; 0o666 leaves the final mode to the umask like open() does
+    flags = os.O_CREAT | os.O_EXCL | os.O_WRONLY
+    try:
+        fd = os.open(tmp_path, flags, 0o666)
+    except FileNotFoundError:
+        # The directory was removed after _ensure_output_dir cached it; recreate once
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(tmp_path, flags, 0o666)
+    encoding = None if "b" in mode else "utf-8"
+    try:
+        with os.fdopen(fd, mode, encoding=encoding) as handle:
+            yield handle
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    _fsync_dir(path.parent)
+
+
+def _fsync_dir(directory: Path) -> None:
+    """Persist the rename itself; directories cannot be opened for fsync on Windows."""
+    try:
+        dir_fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(dir_fd)
+    except OSError:
+        pass
+    finally:
+        os.close(dir_fd)
+
+
+def persist_json_output(prefix: str, document_id: str, payload: Dict[str, Any], timestamp: Optional[str] = None) -> Path:
     """Write the given payload to Output/prefix_documentid_timestamp.json."""
     output_dir = _ensure_output_dir()
-    timestamp = datetime.now().strftime("%Y%m%dT%H%M%S")
+    timestamp = timestamp or _format_timestamp()
     safe_doc_id = document_id.replace(" ", "_")
     filename = f"{prefix}_{safe_doc_id}_{timestamp}.json"
     path = output_dir / filename
-    serializable_payload = serialize_payload(payload)
-    with path.open("w", encoding="utf-8") as handle:
-        json.dump(serializable_payload, handle, indent=2)
+    # default= normalizes models, datetimes and sets during the single encode pass
+    if orjson is not None:
+        with atomic_open(path, "wb") as handle:
+            handle.write(
+                orjson.dumps(payload, default=json_default, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+            )
+        return path
+    with atomic_open(path, "w") as handle:
+        json.dump(payload, handle, indent=2, default=json_default)
+    return path
+
+
+def persist_ndjson_output(prefix: str, document_id: str, records: Iterable[Any], timestamp: Optional[str] = None) -> Path:
+    """Stream records to Output/prefix_documentid_timestamp.ndjson, one JSON document per line.
+
+    Only one encoded record is held at a time, so large clause/risk lists can be
+    written straight from an iterator.
+    """
+    output_dir = _ensure_output_dir()
+    timestamp = timestamp or _format_timestamp()
+    safe_doc_id = document_id.replace(" ", "_")
+    filename = f"{prefix}_{safe_doc_id}_{timestamp}.ndjson"
+    path = output_dir / filename
+    with atomic_open(path, "wb") as handle:
+        for record in records:
+            if orjson is not None:
+                line = orjson.dumps(record, default=json_default, option=orjson.OPT_NON_STR_KEYS)
+            else:
+                line = json.dumps(record, default=json_default, separators=(",", ":")).encode("utf-8")
+            handle.write(line)
+            handle.write(b"\n")
     return path
 
 
-def persist_markdown_output(prefix: str, document_id: str, markdown: str) -> Path:
+def persist_markdown_output(prefix: str, document_id: str, markdown: str, timestamp: Optional[str] = None) -> Path:
     """Write the provided markdown string to Output/prefix_documentid_timestamp.md."""
     output_dir = _ensure_output_dir()
-    timestamp = datetime.now().strftime("%Y%m%dT%H%M%S")
+    timestamp = timestamp or _format_timestamp()
     safe_doc_id = document_id.replace(" ", "_")
     filename = f"{prefix}_{safe_doc_id}_{timestamp}.md"
     path = output_dir / filename
-    with path.open("w", encoding="utf-8") as handle:
+    with atomic_open(path, "w") as handle:
         handle.write(markdown)
     return path
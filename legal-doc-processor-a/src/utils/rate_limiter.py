@@ -0,0 +1,36 @@
+"""Thread-safe request-rate limiters shared by LLM call sites."""
+from __future__ import annotations
+
+import threading
+import time
+
+
+class TokenBucket:
+    """Token bucket admitting ``rate`` calls per ``per`` seconds with bursts up to ``capacity``.
+
+    Tokens refill continuously, so under sustained load calls are spaced
+    evenly instead of stalling for a whole window once a quota is used up.
+    Any ``per``-second window admits at most ``capacity + rate`` calls, so keep
+    ``capacity`` small when ``rate`` is a hard per-window quota.
+    """
+
+    def __init__(self, rate: float, per: float = 60.0, capacity: float = 1.0) -> None:
+        self.capacity = max(float(capacity), 1.0)
+        self.refill_per_sec = max(float(rate), 1e-9) / per
+        self.tokens = self.capacity
+        self.last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        """Block until a token is available, then consume it."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.refill_per_sec)
+                self.last_refill = now
+                # Tolerate float rounding so a sleep of exactly the computed delay always admits
+                if self.tokens >= 1 - 1e-9:
+                    self.tokens = max(self.tokens - 1, 0.0)
+                    return
+                delay = (1 - self.tokens) / self.refill_per_sec
+            time.sleep(delay)
@@ -1,149 +1,180 @@
-from datetime import datetime
-from typing import Any, Dict, Iterable, List, cast
+import io
+import re
+import time
+from functools import singledispatch
+from itertools import islice
+from typing import Any, Dict, Iterable, Optional, cast
 
+from pydantic import BaseModel
 
+
+_HIGHLIGHT_LIMIT = 5
+
+
+@singledispatch
 def _to_dict(item: Any) -> Dict[str, Any]:
-    if item is None:
-        return {}
-    if hasattr(item, "dict") and callable(item.dict):
-        return cast(Dict[str, Any], item.dict())
+    # Rare duck-typed objects; pydantic models and dicts dispatch directly below
     if hasattr(item, "model_dump") and callable(item.model_dump):
         return cast(Dict[str, Any], item.model_dump())
-    if isinstance(item, dict):
-        return item
+    if hasattr(item, "dict") and callable(item.dict):
+        return cast(Dict[str, Any], item.dict())
     return {}
 
 
+@_to_dict.register
+def _(item: BaseModel) -> Dict[str, Any]:
+    return item.model_dump()
+
+
+@_to_dict.register
+def _(item: dict) -> Dict[str, Any]:
+    return item
+
+
+@_to_dict.register
+def _(item: None) -> Dict[str, Any]:
+    return {}
+
+
+# Whitespace runs or any non-space whitespace; lone spaces never match, so clean text is untouched
+_WS_RE = re.compile(r"\s{2,}|[^\S ]")
+
+
 def _truncate(text: str, limit: int = 240) -> str:
-    sanitized = (text or "").strip().replace("\n", " ")
+    if not text:
+        return ""
+    sanitized = _WS_RE.sub(" ", text.strip())
     if len(sanitized) <= limit:
         return sanitized
     return f"{sanitized[:limit].rstrip()}..."
 
 
+_FMT_2 = "{:.2f}".format
+
+
 def _format_float(value: Any, precision: int = 2, fallback: str = "n/a") -> str:
+    # Numbers (the common case from pydantic models) skip float() and the try block
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return _FMT_2(value) if precision == 2 else f"{value:.{precision}f}"
     try:
         return f"{float(value):.{precision}f}"
     except (TypeError, ValueError):
         return fallback
 
 
-def build_adk_a_markdown_report(result: Dict[str, Any]) -> str:
-    """Render a readable Markdown summary for ADK-A outputs."""
-    generated_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+def build_adk_a_markdown_report(result: Dict[str, Any], generated_at: Optional[str] = None) -> str:
+    """Render a readable Markdown summary for ADK-A outputs.
+
+    Pass ``generated_at`` to stamp several reports identically or make output reproducible.
+    """
+    generated_at = generated_at or time.strftime("%Y-%m-%d %H:%M:%S")
     doc_id = result.get("document_id", "unknown")
     status = result.get("status", "unknown").upper()
     ready = result.get("ready_for_suggestions", False)
 
-    lines: List[str] = [
-        "# ADK-A Document Processing Report",
-        "",
-        f"**Document ID:** {doc_id}",
-        f"**Generated:** {generated_at}",
-        f"**Processing Status:** {status}",
-        "",
-        "---",
-        "",
-        "## Analysis Metrics",
-        "",
-        "| Metric | Value |",
-        "|--------|-------|",
-        f"| Clauses Extracted | {result.get('clause_count', 0)} |",
-        f"| High-Risk Clauses | {result.get('high_risk_count', 0)} |",
-        f"| Overall Risk Score | {_format_float(result.get('overall_risk_score', 0.0))}/10.00 |",
-        f"| Document Type | {result.get('document_type', 'n/a')} |",
-        f"| Page Count | {result.get('page_count', 'n/a')} |",
-        f"| Ready For Suggestions | {'Yes' if ready else 'No'} |",
-        "",
-    ]
-
-    clauses = [_to_dict(item) for item in result.get("extracted_clauses", [])]
+    buf = io.StringIO()
+    write = buf.write
+    write(
+        "# ADK-A Document Processing Report\n"
+        "\n"
+        f"**Document ID:** {doc_id}\n"
+        f"**Generated:** {generated_at}\n"
+        f"**Processing Status:** {status}\n"
+        "\n"
+        "---\n"
+        "\n"
+        "## Analysis Metrics\n"
+        "\n"
+        "| Metric | Value |\n"
+        "|--------|-------|\n"
+        f"| Clauses Extracted | {result.get('clause_count', 0)} |\n"
+        f"| High-Risk Clauses | {result.get('high_risk_count', 0)} |\n"
+        f"| Overall Risk Score | {_format_float(result.get('overall_risk_score', 0.0))}/10.00 |\n"
+        f"| Document Type | {result.get('document_type', 'n/a')} |\n"
+        f"| Page Count | {result.get('page_count', 'n/a')} |\n"
+        f"| Ready For Suggestions | {'Yes' if ready else 'No'} |\n"
+        "\n"
+    )
+
+    # Only the first few items are rendered, so convert just those
+    clauses = [_to_dict(item) for item in islice(result.get("extracted_clauses") or (), _HIGHLIGHT_LIMIT)]
     if clauses:
-        lines.extend([
-            "## Clause Highlights",
-            "",
-        ])
-        for clause in clauses[:5]:
+        write("## Clause Highlights\n\n")
+        for clause in clauses:
             clause_id = clause.get("id", "clause")
             clause_type = clause.get("type", "general").title()
             location = clause.get("location", "unspecified")
             confidence = _format_float(clause.get("confidence"))
             excerpt = _truncate(clause.get("text", "")) or "_No clause text available._"
-            lines.extend([
-                f"### {clause_id} · {clause_type}",
-                f"- Location: {location}",
-                f"- Confidence: {confidence}",
-                "",
-                excerpt,
-                "",
-            ])
-
-    risks = [_to_dict(item) for item in result.get("risk_assessments", [])]
+            write(
+                f"### {clause_id} · {clause_type}\n"
+                f"- Location: {location}\n"
+                f"- Confidence: {confidence}\n"
+                "\n"
+                f"{excerpt}\n"
+                "\n"
+            )
+
+    risks = [_to_dict(item) for item in islice(result.get("risk_assessments") or (), _HIGHLIGHT_LIMIT)]
     if risks:
-        lines.extend([
-            "## Risk Highlights",
-            "",
-        ])
-        for risk in risks[:5]:
+        write("## Risk Highlights\n\n")
+        for risk in risks:
             clause_ref = risk.get("clause_id", "n/a")
             level = risk.get("risk_level", "unknown")
             severity = _format_float(risk.get("severity_score"))
             description = _truncate(risk.get("risk_description", "")) or "_Description not provided._"
             frameworks = ", ".join(risk.get("risk_factors", [])) if risk.get("risk_factors") else "n/a"
-            lines.extend([
-                f"- **Clause:** {clause_ref} · **Level:** {level} · **Severity:** {severity}",
-                f"  - Factors: {frameworks}",
-                f"  - Detail: {description}",
-            ])
-        lines.append("")
+            write(
+                f"- **Clause:** {clause_ref} · **Level:** {level} · **Severity:** {severity}\n"
+                f"  - Factors: {frameworks}\n"
+                f"  - Detail: {description}\n"
+            )
+        write("\n")
 
     planning_notes = result.get("planning_notes") or []
     if planning_notes:
-        lines.extend([
-            "## Planning Notes",
-            "",
-        ])
+        write("## Planning Notes\n\n")
         for note in planning_notes[:5]:
-            lines.append(f"- {note}")
+            write(f"- {note}\n")
         if len(planning_notes) > 5:
-            lines.append(f"- ...and {len(planning_notes) - 5} more notes")
-        lines.append("")
+            write(f"- ...and {len(planning_notes) - 5} more notes\n")
+        write("\n")
 
     context_bundle = result.get("context_bundle") or {}
     if context_bundle:
         keys = ", ".join(sorted(context_bundle.keys()))
-        lines.extend([
-            "## Context Bundle",
-            "",
-            f"Available Keys: {keys if keys else 'n/a'}",
-            "",
-        ])
+        write(
+            "## Context Bundle\n"
+            "\n"
+            f"Available Keys: {keys if keys else 'n/a'}\n"
+            "\n"
+        )
 
     errors = result.get("errors") or []
-    lines.extend([
-        "## System Status",
-        "",
-        f"- Ready for ADK-B: {'Yes' if ready else 'No'}",
-        f"- Recorded Errors: {len(errors)}",
-    ])
+    write(
+        "## System Status\n"
+        "\n"
+        f"- Ready for ADK-B: {'Yes' if ready else 'No'}\n"
+        f"- Recorded Errors: {len(errors)}\n"
+    )
     if errors:
         for err in errors[:5]:
-            lines.append(f"  - {err}")
+            write(f"  - {err}\n")
         if len(errors) > 5:
-            lines.append(f"  - ...and {len(errors) - 5} more errors")
-    lines.append("")
-
-    lines.extend([
-        "## Next Steps",
-        "",
-        "1. Review highlighted clauses and risk notes.",
-        "2. Address high-risk clauses before execution.",
-        "3. Trigger ADK-B suggestions if not already queued.",
-        "4. Update the document and rerun this workflow as needed.",
-        "",
-        "---",
-        "",
-        "_Report auto-generated by ADK-A._",
-    ])
-
-    return "\n".join(lines).strip()
+            write(f"  - ...and {len(errors) - 5} more errors\n")
+    write("\n")
+
+    write(
+        "## Next Steps\n"
+        "\n"
+        "1. Review highlighted clauses and risk notes.\n"
+        "2. Address high-risk clauses before execution.\n"
+        "3. Trigger ADK-B suggestions if not already queued.\n"
+        "4. Update the document and rerun this workflow as needed.\n"
+        "\n"
+        "---\n"
+        "\n"
+        "_Report auto-generated by ADK-A._"
+    )
+
+    return buf.getvalue().strip()
\ No newline at end of file
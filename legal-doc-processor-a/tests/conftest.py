@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# Modules import each other as ``src.*`` relative to the ADK-A root
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
@@ -0,0 +1,108 @@
+import pytest
+
+from src.state.cow_state import CopyOnWriteDict
+
+
+def _base():
+    audit_log = [{"step": "parse"}]
+    return {
+        "audit_log": audit_log,
+        "metadata": {"source": "upload"},
+        "tags": {"nda"},
+        "document_id": "doc-1",
+        "status": "parsed",
+    }
+
+
+def test_in_place_mutations_do_not_touch_base():
+    base = _base()
+    audit_log = base["audit_log"]
+    view = CopyOnWriteDict(base)
+
+    view["audit_log"].append({"step": "risk"})
+    view["metadata"]["reviewer"] = "legal"
+    view["tags"].add("msa")
+    view["status"] = "analyzed"
+    view["summary"] = "short"
+
+    assert base["audit_log"] is audit_log
+    assert audit_log == [{"step": "parse"}]
+    assert base["metadata"] == {"source": "upload"}
+    assert base["tags"] == {"nda"}
+    assert base["status"] == "parsed"
+    assert "summary" not in base
+
+    assert view["audit_log"] == [{"step": "parse"}, {"step": "risk"}]
+    assert view["metadata"] == {"source": "upload", "reviewer": "legal"}
+    assert view["tags"] == {"nda", "msa"}
+    assert view["status"] == "analyzed"
+
+
+def test_repeated_reads_return_same_copy():
+    base = _base()
+    view = CopyOnWriteDict(base)
+
+    assert view["audit_log"] is view["audit_log"]
+    assert view["audit_log"] is not base["audit_log"]
+    assert view["document_id"] is base["document_id"]
+
+
+def test_delete_pop_and_membership():
+    base = _base()
+    view = CopyOnWriteDict(base)
+
+    del view["status"]
+    assert "status" not in view
+    assert "status" in base
+    with pytest.raises(KeyError):
+        view["status"]
+    with pytest.raises(KeyError):
+        del view["status"]
+
+    view["status"] = "restored"
+    assert view["status"] == "restored"
+
+    assert view.pop("document_id") == "doc-1"
+    assert view.pop("document_id", None) is None
+    with pytest.raises(KeyError):
+        view.pop("document_id")
+    assert base["document_id"] == "doc-1"
+
+    view["extra"] = 1
+    del view["extra"]
+    assert "extra" not in view
+
+
+def test_iteration_and_len_follow_overrides_and_deletes():
+    base = _base()
+    view = CopyOnWriteDict(base)
+
+    view["status"] = "analyzed"
+    view["summary"] = "short"
+    del view["tags"]
+
+    keys = list(view)
+    assert sorted(keys) == sorted(["audit_log", "metadata", "document_id", "status", "summary"])
+    assert len(keys) == len(set(keys))
+    assert len(view) == 5
+    assert len(base) == 5
+
+
+def test_to_dict_materializes_view():
+    base = _base()
+    view = CopyOnWriteDict(base)
+
+    view["audit_log"].append({"step": "risk"})
+    view["status"] = "analyzed"
+    del view["tags"]
+
+    result = view.to_dict()
+    assert type(result) is dict
+    assert result == {
+        "audit_log": [{"step": "parse"}, {"step": "risk"}],
+        "metadata": {"source": "upload"},
+        "document_id": "doc-1",
+        "status": "analyzed",
+    }
+    assert result["audit_log"] is view["audit_log"]
+    assert base["audit_log"] == [{"step": "parse"}]
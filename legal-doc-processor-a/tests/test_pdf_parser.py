@@ -0,0 +1,109 @@
+from pypdf import PdfWriter
+
+from src.tools import pdf_parser
+from src.tools.pdf_parser import DocumentParser, ParsedDoc
+
+
+PAGES = ["First page text.", "", "Third page\nwith two lines."]
+
+
+def _write_pdf(path, page_count=len(PAGES)):
+    writer = PdfWriter()
+    for _ in range(page_count):
+        writer.add_blank_page(width=72, height=72)
+    writer.add_metadata({"/Author": "Tester", "/Title": str(path.name)})
+    with open(path, "wb") as handle:
+        writer.write(handle)
+    return str(path)
+
+
+def _stub_pages(monkeypatch, pages=PAGES):
+    calls = []
+
+    def fake_extract(file_path, reader):
+        calls.append(file_path)
+        return list(pages)
+
+    monkeypatch.setattr(DocumentParser, "_extract_pages", staticmethod(fake_extract))
+    return calls
+
+
+def test_parse_pdf_keeps_old_join_format(tmp_path, monkeypatch):
+    _stub_pages(monkeypatch)
+    result = DocumentParser.parse_pdf(_write_pdf(tmp_path / "doc.pdf"))
+
+    expected = "\n".join(f"[Page {n}]\n{text}\n" for n, text in enumerate(PAGES, start=1))
+    assert isinstance(result, ParsedDoc)
+    assert result.full_text == expected
+    assert result["full_text"] == expected
+    assert result.metadata["page_count"] == len(PAGES)
+    assert result.metadata["author"] == "Tester"
+    assert result["format"] == "pdf"
+
+
+def test_page_text_slices_each_page(tmp_path, monkeypatch):
+    _stub_pages(monkeypatch)
+    result = DocumentParser.parse_pdf(_write_pdf(tmp_path / "doc.pdf"))
+
+    for page_num, text in enumerate(PAGES, start=1):
+        assert result.page_text(page_num) == text
+    assert result.page_texts == {f"page_{n}": text for n, text in enumerate(PAGES, start=1)}
+    assert result.get("page_texts") == result.page_texts
+    assert result.get("missing", "default") == "default"
+    assert "page_texts" in result and "missing" not in result
+
+
+def test_parse_cache_serves_second_parse(tmp_path, monkeypatch):
+    monkeypatch.setattr(pdf_parser, "_PARSE_CACHE_ENABLED", True)
+    monkeypatch.setenv("ADK_PARSE_CACHE_DIR", str(tmp_path / "cache"))
+    calls = _stub_pages(monkeypatch)
+    path = _write_pdf(tmp_path / "doc.pdf")
+
+    first = DocumentParser.parse_document(path)
+    second = DocumentParser.parse_document(path)
+
+    assert len(calls) == 1
+    assert isinstance(second, ParsedDoc)
+    assert second.full_text == first.full_text
+    assert second.metadata == first.metadata
+    assert second.page_text(3) == PAGES[2]
+    assert len(list((tmp_path / "cache").glob("*.json"))) == 1
+
+
+def test_parse_cache_disabled_by_default(tmp_path, monkeypatch):
+    monkeypatch.setattr(pdf_parser, "_PARSE_CACHE_ENABLED", False)
+    monkeypatch.setenv("ADK_PARSE_CACHE_DIR", str(tmp_path / "cache"))
+    calls = _stub_pages(monkeypatch)
+    path = _write_pdf(tmp_path / "doc.pdf")
+
+    DocumentParser.parse_document(path)
+    DocumentParser.parse_document(path)
+
+    assert len(calls) == 2
+    assert not (tmp_path / "cache").exists()
+
+
+def test_parse_cache_evicts_least_recently_used(tmp_path, monkeypatch):
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setattr(pdf_parser, "_PARSE_CACHE_ENABLED", True)
+    monkeypatch.setattr(pdf_parser, "_PARSE_CACHE_MAX_ENTRIES", 2)
+    monkeypatch.setenv("ADK_PARSE_CACHE_DIR", str(cache_dir))
+    _stub_pages(monkeypatch)
+    # Different page counts give each file different bytes, hence its own cache entry
+    paths = [_write_pdf(tmp_path / f"doc{n}.pdf", page_count=n) for n in (1, 2, 3)]
+
+    DocumentParser.parse_document(paths[0])
+    DocumentParser.parse_document(paths[1])
+    entry_a = DocumentParser._parse_cache_path(paths[0])
+    entry_b = DocumentParser._parse_cache_path(paths[1])
+    pdf_parser.os.utime(entry_a, (1000, 1000))
+    pdf_parser.os.utime(entry_b, (2000, 2000))
+
+    # A cache hit refreshes entry_a, so entry_b becomes the least recently used
+    DocumentParser.parse_document(paths[0])
+    DocumentParser.parse_document(paths[2])
+
+    assert entry_a.exists()
+    assert not entry_b.exists()
+    assert DocumentParser._parse_cache_path(paths[2]).exists()
+    assert len(list(cache_dir.glob("*.json"))) == 2
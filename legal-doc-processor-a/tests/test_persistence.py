@@ -0,0 +1,76 @@
+import json
+import os
+import shutil
+from datetime import datetime
+
+import pytest
+
+from src.state.shared_state import Clause
+from src.utils import persistence
+from src.utils.persistence import atomic_open
+
+
+def test_atomic_open_replaces_target(tmp_path):
+    target = tmp_path / "out.json"
+    target.write_text("old", encoding="utf-8")
+
+    with atomic_open(target, "w") as handle:
+        handle.write("new")
+
+    assert target.read_text(encoding="utf-8") == "new"
+    assert os.listdir(tmp_path) == ["out.json"]
+
+
+def test_atomic_open_keeps_original_on_error(tmp_path):
+    target = tmp_path / "out.md"
+    target.write_bytes(b"original")
+
+    with pytest.raises(RuntimeError):
+        with atomic_open(target, "wb") as handle:
+            handle.write(b"partial")
+            raise RuntimeError("boom")
+
+    assert target.read_bytes() == b"original"
+    assert os.listdir(tmp_path) == ["out.md"]
+
+
+def test_atomic_open_mode_matches_plain_open(tmp_path):
+    reference = tmp_path / "reference"
+    reference.write_text("x", encoding="utf-8")
+    target = tmp_path / "target"
+
+    with atomic_open(target, "w") as handle:
+        handle.write("x")
+
+    assert target.stat().st_mode == reference.stat().st_mode
+
+
+def test_atomic_open_recreates_deleted_directory(tmp_path):
+    output_dir = tmp_path / "Output"
+    output_dir.mkdir()
+    shutil.rmtree(output_dir)
+
+    with atomic_open(output_dir / "report.md", "w") as handle:
+        handle.write("ok")
+
+    assert (output_dir / "report.md").read_text(encoding="utf-8") == "ok"
+
+
+def test_persist_outputs_share_batch_timestamp(tmp_path, monkeypatch):
+    monkeypatch.setenv("ADK_OUTPUT_DIR", str(tmp_path))
+    clause = Clause(id="c1", type="liability", text="Cap at fees.", location="p1", confidence=0.9)
+    payload = {"document_id": "doc 1", "extracted_clauses": [clause], "processed_at": datetime(2024, 1, 2, 3, 4, 5)}
+
+    with persistence.persist_batch() as timestamp:
+        json_path = persistence.persist_json_output("adk_a", "doc 1", payload, timestamp=timestamp)
+        ndjson_path = persistence.persist_ndjson_output(
+            "adk_a_clauses", "doc 1", payload["extracted_clauses"], timestamp=timestamp
+        )
+
+    assert json_path.name == f"adk_a_doc_1_{timestamp}.json"
+    assert ndjson_path.name == f"adk_a_clauses_doc_1_{timestamp}.ndjson"
+    archived = json.loads(json_path.read_text(encoding="utf-8"))
+    assert archived["extracted_clauses"][0]["id"] == "c1"
+    assert archived["processed_at"].startswith("2024-01-02T03:04:05")
+    lines = ndjson_path.read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["id"] for line in lines] == ["c1"]
@@ -0,0 +1,47 @@
+import pytest
+
+from src.tools.rag_retriever import RAGRetriever
+
+
+def _mock_retriever(use_tfidf):
+    retriever = RAGRetriever()
+    dataset = retriever._create_mock_dataset()
+    if use_tfidf:
+        retriever._build_index(dataset)
+    else:
+        retriever._doc_terms = tuple(frozenset(doc["text"].lower().split()) for doc in dataset)
+    retriever.dataset = dataset
+    return retriever
+
+
+def test_tfidf_ranks_matching_precedent_first():
+    pytest.importorskip("sklearn")
+    retriever = _mock_retriever(use_tfidf=True)
+    assert retriever._vectorizer is not None
+
+    results = retriever.retrieve_similar_clauses("Party shall indemnify and hold harmless against claims", top_k=3)
+
+    assert len(results) == 3
+    assert results[0]["category"] == "indemnification"
+    similarities = [result["similarity"] for result in results]
+    assert similarities == sorted(similarities, reverse=True)
+    assert all(isinstance(value, float) for value in similarities)
+    assert set(results[0]) == {"text", "category", "risk_level", "similarity"}
+
+
+def test_tfidf_agrees_with_keyword_fallback_on_top_match():
+    pytest.importorskip("sklearn")
+    query = "Either party may terminate with 30 days written notice"
+
+    tfidf_top = _mock_retriever(use_tfidf=True).retrieve_similar_clauses(query, top_k=1)
+    keyword_top = _mock_retriever(use_tfidf=False).retrieve_similar_clauses(query, top_k=1)
+
+    assert tfidf_top[0]["category"] == keyword_top[0]["category"] == "termination"
+
+
+def test_unrelated_query_scores_zero():
+    pytest.importorskip("sklearn")
+    results = _mock_retriever(use_tfidf=True).retrieve_similar_clauses("xyzzy plugh", top_k=5)
+
+    assert len(results) == 5
+    assert all(result["similarity"] == 0.0 for result in results)
@@ -0,0 +1,42 @@
+from src.utils import rate_limiter
+from src.utils.rate_limiter import TokenBucket
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def _admission_times(monkeypatch, bucket_factory, calls):
+    clock = FakeClock()
+    monkeypatch.setattr(rate_limiter.time, "monotonic", clock.monotonic)
+    monkeypatch.setattr(rate_limiter.time, "sleep", clock.sleep)
+    bucket = bucket_factory()
+    times = []
+    for _ in range(calls):
+        bucket.wait()
+        times.append(clock.now)
+    return times
+
+
+def _max_in_window(times, window):
+    return max(sum(1 for t in times if start <= t < start + window) for start in times)
+
+
+def test_llm_bucket_never_exceeds_rpm_in_any_window(monkeypatch):
+    rpm = 8
+    times = _admission_times(monkeypatch, lambda: TokenBucket(max(rpm - 1, 0.5), capacity=1), 40)
+    assert _max_in_window(times, 60.0) <= rpm
+
+
+def test_full_bucket_admits_capacity_plus_rate(monkeypatch):
+    rpm = 8
+    times = _admission_times(monkeypatch, lambda: TokenBucket(rpm, capacity=rpm), 40)
+    assert _max_in_window(times, 60.0) > rpm
+    assert _max_in_window(times, 60.0) <= 2 * rpm
@@ -0,0 +1,147 @@
+import re
+
+from src.state.shared_state import Clause, RiskAssessment
+from src.utils.reporting import _truncate, build_adk_a_markdown_report
+
+
+GENERATED_AT = "2024-05-06 07:08:09"
+
+EXPECTED_REPORT = """\
+# ADK-A Document Processing Report
+
+**Document ID:** doc-1
+**Generated:** 2024-05-06 07:08:09
+**Processing Status:** COMPLETED
+
+---
+
+## Analysis Metrics
+
+| Metric | Value |
+|--------|-------|
+| Clauses Extracted | 2 |
+| High-Risk Clauses | 1 |
+| Overall Risk Score | 6.50/10.00 |
+| Document Type | contract |
+| Page Count | 3 |
+| Ready For Suggestions | Yes |
+
+## Clause Highlights
+
+### c1 · Liability
+- Location: Page 1
+- Confidence: 0.90
+
+Liability is capped at fees paid.
+
+### c2 · Termination
+- Location: Page 2
+- Confidence: n/a
+
+_No clause text available._
+
+## Risk Highlights
+
+- **Clause:** c1 · **Level:** HIGH · **Severity:** 8.25
+  - Factors: uncapped, one-sided
+  - Detail: Cap excludes data breaches.
+
+## Planning Notes
+
+- Used standard model
+
+## Context Bundle
+
+Available Keys: clauses, risks
+
+## System Status
+
+- Ready for ADK-B: Yes
+- Recorded Errors: 1
+  - timeout
+
+## Next Steps
+
+1. Review highlighted clauses and risk notes.
+2. Address high-risk clauses before execution.
+3. Trigger ADK-B suggestions if not already queued.
+4. Update the document and rerun this workflow as needed.
+
+---
+
+_Report auto-generated by ADK-A._"""
+
+
+def _result():
+    return {
+        "document_id": "doc-1",
+        "status": "completed",
+        "ready_for_suggestions": True,
+        "clause_count": 2,
+        "high_risk_count": 1,
+        "overall_risk_score": 6.5,
+        "document_type": "contract",
+        "page_count": 3,
+        "extracted_clauses": [
+            Clause(id="c1", type="liability", text="Liability is capped at fees paid.", location="Page 1", confidence=0.9),
+            {"id": "c2", "type": "termination", "text": "", "location": "Page 2", "confidence": "n/a"},
+        ],
+        "risk_assessments": [
+            RiskAssessment(
+                clause_id="c1",
+                risk_level="HIGH",
+                risk_description="Cap excludes data breaches.",
+                risk_factors=["uncapped", "one-sided"],
+                severity_score=8.25,
+                model_used="m",
+            )
+        ],
+        "planning_notes": ["Used standard model"],
+        "context_bundle": {"risks": 1, "clauses": 2},
+        "errors": ["timeout"],
+    }
+
+
+def test_report_matches_expected_markdown():
+    assert build_adk_a_markdown_report(_result(), generated_at=GENERATED_AT) == EXPECTED_REPORT
+
+
+def test_models_and_plain_dicts_render_identically():
+    plain = _result()
+    plain["extracted_clauses"] = [
+        item.model_dump() if hasattr(item, "model_dump") else item for item in plain["extracted_clauses"]
+    ]
+    plain["risk_assessments"] = [item.model_dump() for item in plain["risk_assessments"]]
+
+    assert build_adk_a_markdown_report(plain, generated_at=GENERATED_AT) == EXPECTED_REPORT
+
+
+def test_highlights_and_notes_are_capped():
+    result = _result()
+    result["extracted_clauses"] = [
+        {"id": f"c{i}", "type": "general", "text": "x", "location": "p", "confidence": 0.5} for i in range(8)
+    ]
+    result["planning_notes"] = [f"note {i}" for i in range(7)]
+    result["errors"] = [f"err {i}" for i in range(6)]
+
+    report = build_adk_a_markdown_report(result, generated_at=GENERATED_AT)
+
+    assert re.findall(r"^### (c\d)", report, flags=re.M) == ["c0", "c1", "c2", "c3", "c4"]
+    assert "- ...and 2 more notes" in report
+    assert "  - ...and 1 more errors" in report
+
+
+def test_generated_at_defaults_to_current_time():
+    report = build_adk_a_markdown_report({"document_id": "doc-1"})
+
+    assert re.search(r"^\*\*Generated:\*\* \d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}$", report, flags=re.M)
+    assert "**Processing Status:** UNKNOWN" in report
+
+
+def test_truncate_collapses_whitespace_and_caps_length():
+    assert _truncate("") == ""
+    assert _truncate("  one\n\ttwo   three  ") == "one two three"
+    long_text = "word " * 100
+    truncated = _truncate(long_text, limit=20)
+    assert truncated.endswith("...")
+    assert len(truncated) <= 23